@@ -2,6 +2,9 @@
 
 import sqlite3
 import json
+import base64
+import sys
+from array import array
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -923,8 +926,17 @@ class WorkoutDatabase:
                         # If we have raw power samples and either explicit numeric power bounds or an FTP, compute percent-time-in-zone
                         if power_series and (athlete_power_zone_bounds or ftp_for_zones):
                             try:
-                                # Normalize samples to floats and filter invalid entries
-                                samples = [float(x) for x in power_series if x is not None]
+                                # Normalize samples to floats and filter invalid entries. The FIT
+                                # parser stores them as base64 little-endian float32 bytes; older
+                                # rows hold a plain list
+                                if isinstance(power_series, str):
+                                    decoded = array('f')
+                                    decoded.frombytes(base64.b64decode(power_series))
+                                    if sys.byteorder == 'big':
+                                        decoded.byteswap()
+                                    samples = decoded.tolist()
+                                else:
+                                    samples = [float(x) for x in power_series if x is not None]
                                 total = len(samples)
                                 if total > 0:
                                     zone_names = [
@@ -27,6 +27,7 @@ except Exception:
     pass
 from datetime import datetime, timedelta, date
 from typing import Any, Optional, cast
+import logging
 import requests
 import json
 import importlib
@@ -2498,6 +2499,14 @@ elif page == '📥 Import Data':
             else:
                 st.warning("Please select both start and end dates")
             
+            force_upload = st.checkbox(
+                "Re-upload FIT files that were already uploaded",
+                value=False,
+                key="auto_force_upload",
+                help="Use after resetting or recreating the database; otherwise FIT files "
+                     "the API already accepted are skipped"
+            )
+            
             # Sync button
             if st.button("🚀 Start Automated Sync", type="primary", use_container_width=True):
                 st.markdown("---")
@@ -2513,15 +2522,25 @@ elif page == '📥 Import Data':
                 try:
                     from ..utils.trainingpeaks_sync import TrainingPeaksSync
                     
+                    # The sync reports progress through logging; print it to the console like
+                    # the standalone script, without touching the root logger Streamlit uses
+                    sync_logger = logging.getLogger(TrainingPeaksSync.__module__)
+                    if not sync_logger.handlers:
+                        sync_handler = logging.StreamHandler()
+                        sync_handler.setFormatter(logging.Formatter("%(message)s"))
+                        sync_logger.addHandler(sync_handler)
+                        sync_logger.setLevel(logging.INFO)
+                    
                     with st.spinner("🌐 Opening browser and running automation..."):
                         sync = TrainingPeaksSync()
-                        results = sync.run_sync(start_date, end_date)
+                        results = sync.run_sync(start_date, end_date, force_upload=force_upload)
                     
                     if results:
                         st.success(f"""
                         ✅ **Sync Complete!**
                         
                         - FIT Files Uploaded: **{results['fit_files']}**
+                        - FIT Files Skipped (already uploaded): **{results.get('fit_files_skipped', 0)}**
                         - Workouts CSV: **{'✅ Success' if results['workouts'] else '❌ Failed'}**
                         - Metrics CSV: **{'✅ Success' if results['metrics'] else '❌ Failed'}**
                         """)
@@ -2687,9 +2706,7 @@ elif page == '📋 Proposed Workouts':
                                     
                                     # Show the list of files
                                     with st.expander("Show generated files"):
-                                        for file_path in zwift_files:
-                                            file_name = os.path.basename(file_path)
-                                            st.markdown(f"- {file_name}")
+                                        st.markdown("\n".join(f"- {os.path.basename(p)}" for p in zwift_files))
                                 
                                 # Display the raw response
                                 with st.expander("View API Response Details"):
@@ -2792,8 +2809,10 @@ elif page == '📈 Weekly Summary':
                     except Exception as e:
                         st.warning(f"Could not extract raw API response text: {e}")
                 
-                # Store summary in session state for form processing
+                # Store summary in session state for form processing; casts of the previous
+                # summary no longer apply
                 st.session_state.current_summary = summary
+                st.session_state.pop('_summary_cast', None)
                 st.session_state.show_notes_form = True
                 
                 # Display summary with error handling
@@ -2914,32 +2933,26 @@ elif page == '📈 Weekly Summary':
                         current_summary = st.session_state.current_summary
 
 
-                        # Create a properly formatted summary object with safe type conversions
-                        try:
-                            # Convert numeric values safely
-                            total_tss = float(current_summary.get('total_tss', 0))
-                        except (ValueError, TypeError):
-                            total_tss = 0.0
-                            
-                        try:
-                            total_training_hours = float(current_summary.get('total_training_hours', 0))
-                        except (ValueError, TypeError):
-                            total_training_hours = 0.0
-                            
-                        try:
-                            sessions_completed = int(current_summary.get('sessions_completed', 0))
-                        except (ValueError, TypeError):
-                            sessions_completed = 0
-                            
-                        try:
-                            avg_sleep_quality = float(current_summary.get('avg_sleep_quality', 0))
-                        except (ValueError, TypeError):
-                            avg_sleep_quality = 0.0
-                            
-                        try:
-                            avg_daily_energy = float(current_summary.get('avg_daily_energy', 0))
-                        except (ValueError, TypeError):
-                            avg_daily_energy = 0.0
+                        # Create a properly formatted summary object with safe type conversions.
+                        # The casts only depend on current_summary, so reuse them across reruns.
+                        # The cache holds the summary itself: an id() could be reused by a new
+                        # summary once the old one is garbage-collected
+                        summary_cast = st.session_state.get('_summary_cast')
+                        if summary_cast is None or summary_cast['_src'] is not current_summary:
+                            summary_cast = {'_src': current_summary}
+                            for field, cast_type in (
+                                ('total_tss', float),
+                                ('total_training_hours', float),
+                                ('sessions_completed', int),
+                                ('avg_sleep_quality', float),
+                                ('avg_daily_energy', float),
+                            ):
+                                try:
+                                    # Convert numeric values safely
+                                    summary_cast[field] = cast_type(current_summary.get(field, 0))
+                                except (ValueError, TypeError):
+                                    summary_cast[field] = cast_type(0)
+                            st.session_state['_summary_cast'] = summary_cast
                         
                         # Handle qualitative_feedback more carefully
                         qualitative_feedback = current_summary.get('qualitative_feedback', [])
@@ -2986,11 +2999,11 @@ elif page == '📈 Weekly Summary':
                         summary_data = {
                             'start_date': weekly_start_date.isoformat(),
                             'end_date': weekly_end_date.isoformat(),
-                            'total_tss': total_tss,
-                            'total_training_hours': total_training_hours,
-                            'sessions_completed': sessions_completed,
-                            'avg_sleep_quality': avg_sleep_quality,
-                            'avg_daily_energy': avg_daily_energy,
+                            'total_tss': summary_cast['total_tss'],
+                            'total_training_hours': summary_cast['total_training_hours'],
+                            'sessions_completed': summary_cast['sessions_completed'],
+                            'avg_sleep_quality': summary_cast['avg_sleep_quality'],
+                            'avg_daily_energy': summary_cast['avg_daily_energy'],
                             'daily_energy': current_summary.get('daily_energy', {}),
                             'daily_sleep_quality': current_summary.get('daily_sleep_quality', {}),
                             'muscle_soreness_patterns': muscle_soreness,
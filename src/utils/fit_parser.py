@@ -1,35 +1,127 @@
 # src/utils/fit_parser.py
 
+import base64
+import copy
 import gzip
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
 from fitparse import FitFile
-from typing import Dict, Any, List, Optional, cast
+from typing import Dict, Any, List, Optional, Tuple, cast
 import numpy as np
 import os
 
-def convert_numpy(obj: Any) -> Any:
-    """Convert numpy types to Python native types"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    return obj
+logger = logging.getLogger(__name__)
+
+# python-isal's igzip is a faster drop-in for gzip.decompress when installed
+try:
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
+
+# numba is optional; without it the power summary falls back to vectorized NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def encode_power_series(power: np.ndarray) -> str:
+    """Pack power samples as base64 little-endian float32 bytes (JSON-safe, no per-sample objects)"""
+    return base64.b64encode(np.asarray(power, dtype='<f4').tobytes()).decode('ascii')
 
 def safe_divide(a: Any, b: Any, default: float = 0.0) -> float:
-    """Safely divide two numbers with fallback to default. Coerces inputs to floats."""
-    try:
-        if a is None or b is None:
-            return default
-        a_f = float(a)
-        b_f = float(b)
-        if b_f == 0:
-            return default
-        return a_f / b_f
-    except Exception:
+    """Divide two numbers, returning default when either is None or the divisor is zero"""
+    if a is None or b is None or b == 0:
         return default
+    return a / b
+
+def _power_summary_loop(power: np.ndarray, zone_edges: np.ndarray, window: int = 30):
+    """
+    Single sweep over the power samples returning (mean, max, normalized power, zone counts).
+    
+    Normalized power uses a sliding-window mean, 4th power, mean, 4th root. Zone counts follow
+    np.digitize: counts[i] is the number of samples x with zone_edges[i-1] <= x < zone_edges[i],
+    so len(counts) == len(zone_edges) + 1.
+    """
+    n = power.shape[0]
+    m = zone_edges.shape[0]
+    counts = np.zeros(m + 1, dtype=np.int64)
+    if n == 0:
+        return 0.0, 0.0, 0.0, counts
+    
+    # For very short workouts, normalized power uses the entire array
+    short = n < window
+    total = 0.0
+    peak = power[0]
+    running_sum = 0.0
+    accum = 0.0
+    count = 0
+    for i in range(n):
+        x = power[i]
+        total += x
+        if x > peak:
+            peak = x
+        z = 0
+        while z < m and x >= zone_edges[z]:
+            z += 1
+        counts[z] += 1
+        if short:
+            x2 = x * x
+            accum += x2 * x2
+            count += 1
+        else:
+            running_sum += x
+            if i >= window:
+                running_sum -= power[i - window]
+            if i >= window - 1:
+                avg = running_sum / window
+                avg2 = avg * avg
+                accum += avg2 * avg2
+                count += 1
+    return total / n, float(peak), np.sqrt(np.sqrt(accum / count)), counts
+
+def _normalized_power_numpy(power: np.ndarray, window: int = 30) -> float:
+    """Normalized power using a prefix-sum rolling mean; used when numba is unavailable"""
+    if len(power) == 0:
+        return 0.0
+    if len(power) >= window:
+        # Standard 30-second rolling average from a prefix sum (O(n), no kernel)
+        cs = np.concatenate(([0.0], np.cumsum(power, dtype=np.float64)))
+        rolling_avg = (cs[window:] - cs[:-window]) / float(window)
+    else:
+        # For very short workouts, use the entire array
+        rolling_avg = power
+    # Squaring twice and two square roots avoid the generic (log/exp) power ufunc
+    rolling_avg_2 = rolling_avg * rolling_avg
+    return float(np.sqrt(np.sqrt(np.mean(rolling_avg_2 * rolling_avg_2))))
+
+def _power_summary_numpy(power: np.ndarray, zone_edges: np.ndarray, window: int = 30):
+    """NumPy equivalent of _power_summary_loop; used when numba is unavailable"""
+    if len(power) == 0:
+        return 0.0, 0.0, 0.0, np.zeros(len(zone_edges) + 1, dtype=np.int64)
+    counts = np.bincount(np.digitize(power, zone_edges), minlength=len(zone_edges) + 1)
+    return (float(np.mean(power, dtype=np.float64)), float(np.max(power)),
+            _normalized_power_numpy(power, window), counts)
+
+# Fused kernel reads each sample once instead of once per statistic
+_power_summary = (njit(cache=True, fastmath=True)(_power_summary_loop)
+                  if njit is not None else _power_summary_numpy)
+
+def _parse_in_worker(args: Tuple[bytes, Optional[float]]) -> Optional[Dict[str, Any]]:
+    """Process-pool entry point for FitParser.parse_many; the parent process caches the result"""
+    file_content, athlete_ftp = args
+    return FitParser()._parse_fit_file_uncached(file_content, athlete_ftp)
 
 class FitParser:
+    # Parsed results shared across instances (the API builds a parser per upload), keyed by
+    # content digest plus everything else that changes the output; least recently used first
+    _PARSE_CACHE_SIZE = 32
+    _parse_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+    _parse_cache_lock = threading.Lock()
+    
     def __init__(self):
         # Define heart rate zones (can be customized)
         self.hr_zones = {
@@ -48,6 +140,106 @@ class FitParser:
             'Zone 4 (Threshold)': (0.91, 1.05),  # 91-105% of FTP
             'Zone 5 (VO2 Max)': (1.06, 1.5)     # Above 105% of FTP
         }
+        
+        # HR zone upper bounds as fractions for np.digitize: values below the first bound land in
+        # zone 1, and anything at or above the last bound falls outside all zones
+        # (scaled in float64, then cast to float32 edges to match the sample arrays; scaling in
+        # float32 would nudge edges like 0.6 * 185 just above the integer boundary)
+        self._hr_bounds = np.array([upper for _, upper in self.hr_zones.values()])
+        # Power zones keep their [lower, upper) bands, gaps included: every lower and upper
+        # bound in order, so with np.digitize zone k is bin 2k + 1 and samples in a gap or at or
+        # above 150% FTP fall in even bins, which are not zones. Scaled edges stay float64 so
+        # comparisons match the per-zone masks exactly
+        self._power_edges = np.array([edge for band in self.power_zones.values() for edge in band],
+                                     dtype=np.float64)
+        self._hr_zone_names = tuple(self.hr_zones)
+        self._power_zone_names = tuple(self.power_zones)
+        
+        self.refresh_env()
+    
+    def refresh_env(self) -> None:
+        """
+        (Re)read the athlete overrides from the environment.
+        
+        ATHLETE_HR_ZONES / ATHLETE_POWER_ZONES are comma-separated upper bounds for zones 1..5,
+        e.g. "138,156,165,173,200"; fewer than five or unparsable values are ignored.
+        ATHLETE_FTP overrides the FTP estimate when no athlete FTP is passed in.
+        """
+        self._custom_hr_bounds = self._parse_zone_bounds(os.environ.get('ATHLETE_HR_ZONES'), int)
+        self._custom_power_bounds = self._parse_zone_bounds(
+            os.environ.get('ATHLETE_POWER_ZONES'), float)
+        try:
+            env_val = os.environ.get('ATHLETE_FTP')
+            self._env_ftp: Optional[float] = float(env_val) if env_val else None
+        except ValueError:
+            self._env_ftp = None
+        # Part of the parse-cache key, since these settings change the parsed metrics
+        self._env_key = (
+            self._env_ftp,
+            None if self._custom_hr_bounds is None else tuple(self._custom_hr_bounds.tolist()),
+            None if self._custom_power_bounds is None else tuple(self._custom_power_bounds.tolist()),
+        )
+    
+    @staticmethod
+    def _parse_zone_bounds(value: Optional[str], cast_type: type) -> Optional[np.ndarray]:
+        """Parse a comma-separated list of five zone upper bounds"""
+        if not value:
+            return None
+        try:
+            bounds = [cast_type(b.strip()) for b in value.split(',') if b.strip()]
+        except ValueError:
+            return None
+        if len(bounds) < 5:
+            return None
+        return np.array(bounds[:5], dtype=np.float64)
+    
+    @classmethod
+    def parse_many(cls, files: List[bytes], athlete_ftp: Optional[float] = None,
+                   workers: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse several FIT files in parallel worker processes, for bulk history imports.
+        
+        Files already in the parse cache are answered from it; the rest are parsed in
+        spawned workers (forking the threaded Streamlit/Playwright host could inherit held
+        locks) and their results are added to this process's cache.
+        Results are returned in input order; a file that fails to parse yields None.
+        """
+        parser = cls()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        pending = []
+        for i, content in enumerate(files):
+            key = parser._cache_key(content, athlete_ftp)
+            cached = cls._cache_get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, key, content))
+        
+        if len(pending) <= 1:
+            for i, _, content in pending:
+                results[i] = parser.parse_fit_file(content, athlete_ftp=athlete_ftp)
+            return results
+        
+        max_workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            parsed = pool.map(_parse_in_worker,
+                              [(content, athlete_ftp) for _, _, content in pending])
+            for (i, key, _), result in zip(pending, parsed):
+                if result is not None:
+                    cls._cache_put(key, result)
+                results[i] = result
+        return results
+    
+    @staticmethod
+    def _estimate_ftp(power_array: np.ndarray) -> float:
+        """Estimate FTP as the 95th-percentile power, averaged over its neighbours to damp spikes"""
+        # np.partition only places the requested ranks (O(n)) instead of sorting everything
+        n = len(power_array)
+        k = min(int(0.95 * n), n - 1)
+        lo, hi = max(k - 1, 0), min(k + 1, n - 1)
+        part = np.partition(power_array, [lo, k, hi])
+        return float(part[lo:hi + 1].mean(dtype=np.float64))
     
     def calculate_tss(self, normalized_power: float, duration_hours: float, ftp: float) -> float:
         """Calculate Training Stress Score (TSS)"""
@@ -57,79 +249,108 @@ class FitParser:
     
     def calculate_hr_zones(self, hr_data: List[int], max_hr: Optional[int] = None) -> Dict[str, float]:
         """Calculate time spent in each heart rate zone as a percentage of total workout duration"""
-        if not hr_data:
+        if hr_data is None or len(hr_data) == 0:
             return {}
 
-        # Allow override of HR zone boundaries via environment variable ATHLETE_HR_ZONES
-        # Expected format: comma-separated upper bounds for zones 1..5, e.g. "138,156,165,173,200"
-        env_zones = os.environ.get('ATHLETE_HR_ZONES')
-        hr_array = np.array([x for x in hr_data if x is not None])
+        # None becomes NaN in a float array; drop it along with any inf
+        hr_array = np.asarray(hr_data, dtype=np.float32)
+        hr_array = hr_array[np.isfinite(hr_array)]
         if len(hr_array) == 0:
             return {}
 
         total_samples = len(hr_array)
+        pct = 100.0 / total_samples
         zones = {}
 
-        if env_zones:
-            try:
-                bounds = [int(b.strip()) for b in env_zones.split(',') if b.strip()]
-                # Expect 5 bounds (upper bound of each zone). If fewer provided, fall back to default behavior.
-                if len(bounds) >= 5:
-                    # Create zone ranges from bounds: zone1: <=bounds[0], zone2: (bounds[0], bounds[1]], ...
-                    lower = None
-                    # Use the same named keys as self.hr_zones for consistency
-                    zone_names = list(self.hr_zones.keys())
-                    for idx, upper in enumerate(bounds[:5]):
-                        try:
-                            if lower is None:
-                                # zone 1
-                                time_in_zone = np.sum(hr_array <= upper)
-                            else:
-                                time_in_zone = np.sum((hr_array > lower) & (hr_array <= upper))
-                        except Exception:
-                            time_in_zone = 0
-                        name = zone_names[idx] if idx < len(zone_names) else f'Zone {idx+1}'
-                        zones[name] = safe_divide(float(time_in_zone) * 100.0, float(total_samples))
-                        lower = upper
-                    return zones
-            except Exception:
-                # If parsing fails, fall back to percentage-of-max behavior below
-                pass
+        # Custom upper bounds from ATHLETE_HR_ZONES: zone 1 is <= bounds[0], zone 2 is
+        # (bounds[0], bounds[1]], ...; anything above the last bound is not counted
+        if self._custom_hr_bounds is not None:
+            counts = np.bincount(np.digitize(hr_array, self._custom_hr_bounds, right=True),
+                                 minlength=6)[:5]
+            for zone_name, count in zip(self._hr_zone_names, counts):
+                zones[zone_name] = float(count) * pct
+            return zones
 
         # Fallback: use percentage-of-max HR ranges defined in self.hr_zones
         if not max_hr:
-            try:
-                max_hr = int(max(x for x in hr_data if x is not None))
-            except Exception:
-                return {}
+            max_hr = int(hr_array.max())
 
-        for zone_name, (lower, upper) in self.hr_zones.items():
-            lower_bound = max_hr * lower
-            upper_bound = max_hr * upper
-            time_in_zone = np.sum((hr_array >= lower_bound) & (hr_array < upper_bound))
-            zones[zone_name] = safe_divide(float(time_in_zone) * 100.0, float(total_samples))
+        # One pass buckets every sample; bucket 5 (>= max HR) is not a zone
+        counts = np.bincount(np.digitize(hr_array, (max_hr * self._hr_bounds).astype(np.float32)),
+                             minlength=6)[:5]
+        for zone_name, count in zip(self._hr_zone_names, counts):
+            zones[zone_name] = float(count) * pct
 
         return zones
     
     def parse_fit_file(self, file_content: bytes, athlete_ftp: Optional[float] = None) -> Optional[Dict[str, Any]]:
-        """Parse a .fit.gz file and extract relevant metrics"""
+        """Parse a .fit.gz file and extract relevant metrics, reusing the result for repeated content"""
+        key = self._cache_key(file_content, athlete_ftp)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._parse_fit_file_uncached(file_content, athlete_ftp)
+        if result is not None:
+            self._cache_put(key, result)
+        return result
+    
+    def _cache_key(self, file_content: bytes, athlete_ftp: Optional[float]) -> Tuple:
+        """Parse-cache key: content digest plus every setting that changes the parsed output"""
+        return (
+            blake2b(file_content, digest_size=16).digest(),
+            athlete_ftp,
+            self._env_key,
+        )
+    
+    @classmethod
+    def _cache_get(cls, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, or None"""
+        cache = cls._parse_cache
+        with cls._parse_cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+        # Callers may modify the result, so never hand out the cached object itself
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    @classmethod
+    def _cache_put(cls, key: Tuple, result: Dict[str, Any]) -> None:
+        """Store a copy of result, evicting the least recently used entries"""
+        with cls._parse_cache_lock:
+            cls._parse_cache[key] = copy.deepcopy(result)
+            while len(cls._parse_cache) > cls._PARSE_CACHE_SIZE:
+                cls._parse_cache.popitem(last=False)
+    
+    def _parse_fit_file_uncached(self, file_content: bytes,
+                                 athlete_ftp: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Decompress and parse a FIT file, then compute power and heart rate metrics"""
         try:
-            # Decompress if gzipped
-            try:
-                decompressed = gzip.decompress(file_content)
-            except Exception:
+            # Decompress if gzipped (checked by magic bytes rather than a failed decompress)
+            if file_content[:2] == b'\x1f\x8b':
+                decompressed = _gzip.decompress(file_content)
+            else:
                 decompressed = file_content
             
-            fitfile = FitFile(decompressed)
+            # Skip fitparse's pure-Python CRC pass; gzip already checksums compressed uploads
+            try:
+                fitfile = FitFile(decompressed, check_crc=False)
+            except TypeError:
+                # Older fitparse releases without the check_crc option
+                fitfile = FitFile(decompressed)
             
-            # Data containers
+            # Data containers: timestamps stay a list (datetimes); samples go into preallocated
+            # float32 buffers with NaN for missing values, doubled in size when full
             timestamps = []
-            power_data = []
-            hr_data = []
-            cadence_data = []
+            capacity = 8192
+            power_buf = np.empty(capacity, dtype=np.float32)
+            hr_buf = np.empty(capacity, dtype=np.float32)
+            cadence_buf = np.empty(capacity, dtype=np.float32)
+            n = 0
             
-            # Extract data
-            for record in fitfile.get_messages('record'):
+            # Extract record samples and detect the sport from session data in one walk
+            sport = None
+            for record in fitfile.get_messages(['record', 'session']):
                 # fitparse message objects sometimes expose get_values(); be defensive for typing
                 try:
                     data_raw = cast(Any, record).get_values()
@@ -138,24 +359,30 @@ class FitParser:
                         data_raw = dict(cast(Any, record))
                     except Exception:
                         data_raw = {}
+                # fitparse already keys values by field name, so the dict is used as-is
+                data = data_raw if isinstance(data_raw, dict) else {}
 
-                # Normalize keys to strings to satisfy static type checkers and unify access
-                try:
-                    if isinstance(data_raw, dict):
-                        data = {str(k): v for k, v in data_raw.items()}
-                    else:
-                        data = {}
-                except Exception:
-                    data = {}
+                if getattr(record, 'name', 'record') == 'session':
+                    if sport is None and 'sport' in data:
+                        sport = str(data['sport']).lower()
+                        logger.debug("Detected sport: %s", sport)
+                    continue
 
-                if 'timestamp' in data:
-                    timestamps.append(data['timestamp'])
-                if 'power' in data:
-                    power_data.append(convert_numpy(data['power']))
-                if 'heart_rate' in data:
-                    hr_data.append(convert_numpy(data['heart_rate']))
-                if 'cadence' in data:
-                    cadence_data.append(convert_numpy(data['cadence']))
+                timestamp = data.get('timestamp')
+                if timestamp is not None:
+                    timestamps.append(timestamp)
+                if n == capacity:
+                    capacity *= 2
+                    power_buf = np.resize(power_buf, capacity)
+                    hr_buf = np.resize(hr_buf, capacity)
+                    cadence_buf = np.resize(cadence_buf, capacity)
+                v = data.get('power')
+                power_buf[n] = v if v is not None else np.nan
+                v = data.get('heart_rate')
+                hr_buf[n] = v if v is not None else np.nan
+                v = data.get('cadence')
+                cadence_buf[n] = v if v is not None else np.nan
+                n += 1
             
             # Calculate duration
             if timestamps:
@@ -166,109 +393,77 @@ class FitParser:
             
             # Process power data
             power_metrics = None
-            if power_data:
-                # CRITICAL: Filter out None values BEFORE creating array
-                power_data_filtered = [x for x in power_data if x is not None and x > 0]
-                
-                if not power_data_filtered:
-                    print("DEBUG: No valid power data after filtering")
-                else:
-                    power_array = np.array(power_data_filtered)
-                    print(f"DEBUG: Processing power data - {len(power_array)} data points")
+            power_array = power_buf[:n]
+            # Drop missing (NaN) and zero samples
+            power_array = power_array[np.isfinite(power_array) & (power_array > 0)]
+            if len(power_array) == 0:
+                logger.debug("No valid power data after filtering")
+            else:
+                logger.debug("Processing power data - %d data points", len(power_array))
                 
                 # Estimate FTP if not provided. Allow override via ATHLETE_FTP env var.
-                env_ftp = None
-                try:
-                    env_val = os.environ.get('ATHLETE_FTP')
-                    env_ftp = float(env_val) if env_val else None
-                except Exception:
-                    env_ftp = None
-
-                ftp = athlete_ftp or env_ftp or float(np.percentile(power_array, 95))
-                print(f"DEBUG: Using FTP of {ftp:.1f} watts")
-                
-                # Calculate normalized power with improved algorithm for outdoor rides
-                # Use 30-second rolling average, but handle edge cases better
-                if len(power_array) >= 30:
-                    # Standard 30-second rolling average
-                    rolling_avg = np.convolve(power_array, np.ones(30)/30, mode='valid')
-                    print(f"DEBUG: Calculated {len(rolling_avg)} rolling averages")
-                else:
-                    # For very short workouts, use the entire array
-                    rolling_avg = power_array
-                    print(f"DEBUG: Using entire power array for short workout ({len(power_array)} points)")
+                ftp = athlete_ftp or self._env_ftp or self._estimate_ftp(power_array)
+                logger.debug("Using FTP of %.1f watts", ftp)
                 
-                # Calculate 4th power average (standard normalized power formula)
-                rolling_avg_4th = np.power(rolling_avg, 4)
-                normalized_power = float(np.power(np.mean(rolling_avg_4th), 0.25))
+                # Mean, max, normalized power (30-second rolling average, 4th-power mean,
+                # 4th root) and power-zone counts in one pass over the samples
+                avg_power, max_power, normalized_power, zone_counts = _power_summary(
+                    np.ascontiguousarray(power_array, dtype=np.float32),
+                    ftp * self._power_edges, 30)
+                avg_power = float(avg_power)
+                normalized_power = float(normalized_power)
                 
                 # Additional validation for outdoor rides
                 # If normalized power seems unreasonable (too high/low), use average power as fallback
-                avg_power = float(np.mean(power_array))
                 if normalized_power > avg_power * 1.5 or normalized_power < avg_power * 0.5:
-                    print(f"Warning: Normalized power ({normalized_power:.1f}) seems unreasonable compared to average power ({avg_power:.1f})")
-                    print("Using average power as normalized power for outdoor ride")
+                    logger.warning("Normalized power (%.1f) seems unreasonable compared to average power "
+                                   "(%.1f); using average power for outdoor ride",
+                                   normalized_power, avg_power)
                     normalized_power = avg_power
                 
-                print(f"DEBUG: Final normalized power: {normalized_power:.1f} watts")
+                logger.debug("Final normalized power: %.1f watts", normalized_power)
+                
+                # Custom watt-based zones from ATHLETE_POWER_ZONES still go through the zone helper
+                if self._custom_power_bounds is not None:
+                    power_zones = self._calculate_power_zones(power_array, ftp)
+                else:
+                    total = float(len(power_array))
+                    # Odd bins of the digitize-style counts are the zones
+                    power_zones = {name: float(count) * 100.0 / total
+                                   for name, count in zip(self._power_zone_names,
+                                                          zone_counts[1::2])}
                 
                 # Calculate TSS
                 tss = self.calculate_tss(normalized_power, duration_hours, ftp)
                 
                 power_metrics = {
-                    'average_power': float(np.mean(power_array)),
+                    'average_power': avg_power,
                     'normalized_power': normalized_power,
-                    'max_power': float(np.max(power_array)),
+                    'max_power': float(max_power),
                     'intensity_factor': float(normalized_power / ftp) if ftp > 0 else None,
                     'tss': float(tss),
-                    'zones': self._calculate_power_zones(power_array, ftp),
-                    # Include the raw power series and the FTP used so callers can recompute zones later
-                    'power_series': convert_numpy(power_array),
+                    'zones': power_zones,
+                    # Include the raw power series and the FTP used so callers can recompute zones
+                    # later (WorkoutDatabase decodes it when recomputing zones)
+                    'power_series': encode_power_series(power_array),
+                    'power_series_dtype': 'float32',
+                    'power_series_len': int(len(power_array)),
                     'ftp': float(ftp)
                 }
             
             # Process heart rate data
             hr_metrics = None
-            if hr_data:
-                # CRITICAL: Filter out None values BEFORE creating array
-                hr_data_filtered = [x for x in hr_data if x is not None and x > 0]
-                
-                if not hr_data_filtered:
-                    print("DEBUG: No valid heart rate data after filtering")
-                else:
-                    hr_array = np.array(hr_data_filtered)
-                    hr_metrics = {
-                        'average_hr': float(np.mean(hr_array)),
-                        'max_hr': float(np.max(hr_array)),
-                        'min_hr': float(np.min(hr_array)),
-                        'zones': self.calculate_hr_zones(hr_data_filtered)  # Use filtered data
-                    }
-            # Detect sport type from session data
-            sport = None
-            try:
-                for session in fitfile.get_messages('session'):
-                    try:
-                        session_raw = cast(Any, session).get_values()
-                    except Exception:
-                        try:
-                            session_raw = dict(cast(Any, session))
-                        except Exception:
-                            session_raw = {}
-
-                    try:
-                        if isinstance(session_raw, dict):
-                            session_data = {str(k): v for k, v in session_raw.items()}
-                        else:
-                            session_data = {}
-                    except Exception:
-                        session_data = {}
-
-                    if 'sport' in session_data:
-                        sport = str(session_data['sport']).lower()
-                        print(f"DEBUG: Detected sport: {sport}")
-                        break
-            except Exception as e:
-                print(f"DEBUG: Could not detect sport: {e}")
+            hr_array = hr_buf[:n]
+            hr_array = hr_array[np.isfinite(hr_array) & (hr_array > 0)]
+            if len(hr_array) == 0:
+                logger.debug("No valid heart rate data after filtering")
+            else:
+                hr_metrics = {
+                    'average_hr': float(np.mean(hr_array, dtype=np.float64)),
+                    'max_hr': float(np.max(hr_array)),
+                    'min_hr': float(np.min(hr_array)),
+                    'zones': self.calculate_hr_zones(hr_array)  # Use filtered data
+                }
             return {
                 'sport': sport,
                 'start_time': timestamps[0].isoformat() if timestamps else None,
@@ -283,7 +478,7 @@ class FitParser:
             }
             
         except Exception as e:
-            print(f"Error parsing FIT file: {str(e)}")
+            logger.error("Error parsing FIT file: %s", e)
             return None
     
     def _calculate_power_zones(self, power_array: np.ndarray, ftp: float) -> Dict[str, float]:
@@ -291,40 +486,28 @@ class FitParser:
         if len(power_array) == 0:
             return {}
             
-        # Filter out None values
-        power_array = np.array([x for x in power_array if x is not None])
+        # Filter out missing (None/NaN) values
+        power_array = np.asarray(power_array, dtype=np.float64)
+        power_array = power_array[np.isfinite(power_array)]
         if len(power_array) == 0:
             return {}
             
-        total_points = len(power_array)
+        total_points = float(len(power_array))
         zones = {}
         
-        # Allow explicit power zone upper bounds via ATHLETE_POWER_ZONES (comma-separated watt values)
-        env_pzones = os.environ.get('ATHLETE_POWER_ZONES')
-        if env_pzones:
-            try:
-                bounds = [float(b.strip()) for b in env_pzones.split(',') if b.strip()]
-                if len(bounds) >= 5:
-                    lower = None
-                    zone_names = list(self.power_zones.keys())
-                    for idx, upper in enumerate(bounds[:5]):
-                        try:
-                            if lower is None:
-                                zone_points = np.sum(power_array <= upper)
-                            else:
-                                zone_points = np.sum((power_array > lower) & (power_array <= upper))
-                        except Exception:
-                            zone_points = 0
-                        name = zone_names[idx] if idx < len(zone_names) else f'Zone {idx+1} (Custom)'
-                        zones[name] = safe_divide(float(zone_points) * 100.0, float(total_points))
-                        lower = upper
-                    return zones
-            except Exception:
-                # If parsing fails, fall back to percentage-of-FTP behavior below
-                pass
+        # Custom watt bounds from ATHLETE_POWER_ZONES: zone 1 is <= bounds[0], zone 2 is
+        # (bounds[0], bounds[1]], ...; anything above bounds[4] is not counted
+        if self._custom_power_bounds is not None:
+            counts = np.bincount(np.digitize(power_array, self._custom_power_bounds, right=True),
+                                 minlength=6)[:5]
+            for zone_name, count in zip(self._power_zone_names, counts):
+                zones[zone_name] = float(count) * 100.0 / total_points
+            return zones
 
-        for zone_name, (lower, upper) in self.power_zones.items():
-            zone_points = np.sum((power_array >= ftp * lower) & (power_array < ftp * upper))
-            zones[zone_name] = safe_divide(float(zone_points) * 100.0, float(total_points))
+        # One pass buckets every sample into the [lower, upper) bands; odd bins are the zones
+        counts = np.bincount(np.digitize(power_array, ftp * self._power_edges),
+                             minlength=len(self._power_edges) + 1)[1::2]
+        for zone_name, count in zip(self._power_zone_names, counts):
+            zones[zone_name] = float(count) * 100.0 / total_points
         
         return zones
\ No newline at end of file
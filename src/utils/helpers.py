@@ -1,12 +1,12 @@
 # src/utils/helpers.py
 
-import pandas as pd
-import numpy as np
+import math
 from typing import Any, Optional
 
 def format_value(value: Any, is_percentage: bool = False) -> str:
     """Format a value for display in AI-ready format"""
-    if pd.isna(value) or value is None:
+    # value != value is only true for NaN
+    if value is None or (isinstance(value, float) and value != value):
         return "N/A"
     
     if isinstance(value, (int, float)):
@@ -18,23 +18,37 @@ def format_value(value: Any, is_percentage: bool = False) -> str:
 
 def clean_float(value: Any) -> Optional[float]:
     """Clean float values, handling NaN and infinite values"""
-    if pd.isna(value) or pd.isnull(value):
+    if value is None:
         return None
-    if isinstance(value, (int, float)):
-        if np.isinf(value) or np.isneginf(value):
-            return None
-        return float(value)
-    return None
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return None
+    # f != f is only true for NaN
+    if f != f or f == math.inf or f == -math.inf:
+        return None
+    return f
 
 def clean_workout_data(data: Any) -> Any:
-    """Recursively clean workout data to remove NaN and infinite values"""
-    if isinstance(data, dict):
-        return {k: clean_workout_data(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [clean_workout_data(v) for v in data]
-    elif isinstance(data, (int, float)):
-        if pd.isna(data) or np.isinf(data) or np.isneginf(data):
-            return None
+    """
+    Clean workout data to remove NaN and infinite values.
+    
+    Nested dicts and lists are walked with an explicit stack and cleaned in place, so the
+    same container is returned and deep payloads cannot hit the recursion limit.
+    """
+    if isinstance(data, float):
+        return None if math.isnan(data) or math.isinf(data) else data
+    if not isinstance(data, (dict, list)):
         return data
-    else:
-        return data
\ No newline at end of file
+    
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        for key, value in (node.items() if isinstance(node, dict) else enumerate(node)):
+            if isinstance(value, float):
+                # Replacing an existing key does not resize the dict, so this is safe mid-iteration
+                if math.isnan(value) or math.isinf(value):
+                    node[key] = None
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return data
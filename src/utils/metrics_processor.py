@@ -1,13 +1,16 @@
+import io
+from datetime import datetime
+from functools import cached_property
 from typing import Dict, Any, List
 
 import pandas as pd
-import io
-
-from datetime import datetime, timedelta
 
 from .fit_parser import FitParser
 from ..storage.database import WorkoutDatabase
 
+# rows per read_csv batch; bounds memory for large exports
+_CSV_CHUNK_ROWS = 50_000
+
 
 class MetricsProcessor:
     """Lightweight metrics/workout processor.
@@ -19,52 +22,88 @@ class MetricsProcessor:
     """
 
     def __init__(self):
-        self.fit_parser = FitParser()
-        self.db = WorkoutDatabase()
-
         # keyed by date (YYYY-MM-DD) -> list of metric rows (dicts)
         self.sleep_metrics: Dict[str, List[Dict[str, Any]]] = {}
 
+        # keyed by date -> sleep quality score, filled when a date is first ingested
+        self.sleep_scores: Dict[str, float] = {}
+
         # keyed by date -> list of workout rows (dicts)
         self.workouts: Dict[str, List[Dict[str, Any]]] = {}
 
         # keyed by (date, title) -> fit metadata (fit_file_id, fit_metrics)
         self.fit_data: Dict[tuple, Dict[str, Any]] = {}
 
+        # keyed by date -> read-only combined rows; cleared whenever the data above changes
+        self._combined_cache: Dict[str, List[Dict[str, Any]]] = {}
+
+    @cached_property
+    def fit_parser(self) -> FitParser:
+        """FIT parser, created on first use."""
+        return FitParser()
+
+    @cached_property
+    def db(self) -> WorkoutDatabase:
+        """Workout database, opened on first use so CSV-only callers skip the sqlite setup."""
+        return WorkoutDatabase()
+
     def process_metrics_csv(self, metrics_data: str) -> None:
         """Process sleep and body metrics CSV content.
 
         The CSV is expected to have at least a Timestamp and Value/Type
         columns. Rows are bucketed by date (YYYY-MM-DD).
         """
-        df = pd.read_csv(io.StringIO(metrics_data))
-        for _, row in df.iterrows():
-            ts = str(row.get('Timestamp', '')).split()[0]
-            if not ts:
-                continue
-            self.sleep_metrics.setdefault(ts, []).append(row.to_dict())
+        # read in bounded batches so peak memory does not grow with the file
+        for chunk in pd.read_csv(io.StringIO(metrics_data), chunksize=_CSV_CHUNK_ROWS):
+            if 'Timestamp' not in chunk.columns:
+                return
+            self._ingest_metrics_chunk(chunk)
+
+    def _ingest_metrics_chunk(self, df: pd.DataFrame) -> None:
+        """Bucket one batch of metrics rows into ``sleep_metrics`` by date."""
+        self._combined_cache.clear()
+        # Date is the first whitespace-separated token of the timestamp, split for the whole
+        # column at once; rows without a timestamp are skipped
+        dates = df['Timestamp'].astype('string').str.split(n=1).str[0]
+        keep = dates.notna().to_numpy()
+        records = df[keep].to_dict(orient='records')
+        sleep_metrics = self.sleep_metrics
+        sleep_scores = self.sleep_scores
+        for date_str, rec in zip(dates[keep].tolist(), records):
+            rows = sleep_metrics.get(date_str)
+            if rows is None:
+                # the score only depends on a date's first row, so score it once here
+                sleep_metrics[date_str] = [rec]
+                sleep_scores[date_str] = self.calculate_sleep_quality_score(rec)
+            else:
+                rows.append(rec)
 
     def process_workouts_csv(self, workouts_data: str) -> None:
         """Process workouts CSV content and store rows by date.
 
         Expected to contain a Timestamp or Date column and Title/Name.
         """
-        df = pd.read_csv(io.StringIO(workouts_data))
+        for chunk in pd.read_csv(io.StringIO(workouts_data), chunksize=_CSV_CHUNK_ROWS):
+            self._ingest_workouts_chunk(chunk)
 
+    def _ingest_workouts_chunk(self, df: pd.DataFrame) -> None:
+        """Store one batch of workout rows in ``workouts`` by date."""
+        self._combined_cache.clear()
         # try a few common date column names
         date_cols = [c for c in df.columns if 'date' in c.lower() or 'timestamp' in c.lower()]
         title_cols = [c for c in df.columns if 'title' in c.lower() or 'name' in c.lower()]
 
-        for _, row in df.iterrows():
-            if date_cols:
-                ts = str(row[date_cols[0]]).split()[0]
-            else:
-                ts = datetime.utcnow().date().isoformat()
+        if date_cols:
+            dates = df[date_cols[0]].astype(str).str.split(n=1).str[0].tolist()
+        else:
+            dates = [datetime.utcnow().date().isoformat()] * len(df)
+        title_col = title_cols[0] if title_cols else 'Title'
 
-            title = row[title_cols[0]] if title_cols else row.to_dict().get('Title')
-            r = row.to_dict()
-            r['title'] = title
-            self.workouts.setdefault(ts, []).append(r)
+        # one bulk conversion instead of a dict per row
+        workouts = self.workouts
+        for ts, rec in zip(dates, df.to_dict(orient='records')):
+            rec['title'] = rec.get(title_col)
+            workouts.setdefault(ts, []).append(rec)
 
     def add_fit_data(self, fit_file_id: int, fit_metrics: Dict[str, Any], date_str: str, title: str) -> None:
         """Attach parsed FIT metrics to a workout identified by date and title.
@@ -73,23 +112,32 @@ class MetricsProcessor:
         """
         key = (date_str, title)
         self.fit_data[key] = {'fit_file_id': fit_file_id, 'fit_metrics': fit_metrics}
+        self._combined_cache.clear()
 
     def get_combined_workout_data(self, date_str: str) -> List[Dict[str, Any]]:
         """Return workouts for a given date with any attached FIT data and
         available metrics (sleep/body battery).
+
+        The combined rows are cached per date until the next ingest or
+        add_fit_data call; each call returns fresh dicts the caller may modify.
         """
-        results: List[Dict[str, Any]] = []
-        for w in self.workouts.get(date_str, []):
-            title = w.get('title') or w.get('Title')
-            combined = dict(w)
-            key = (date_str, title)
-            if key in self.fit_data:
-                combined['fit_file_id'] = self.fit_data[key]['fit_file_id']
-                combined['fit_metrics'] = self.fit_data[key]['fit_metrics']
-            # attach sleep metrics (if any)
-            combined['sleep_metrics'] = self.sleep_metrics.get(date_str, [])
-            results.append(combined)
-        return results
+        cached = self._combined_cache.get(date_str)
+        if cached is None:
+            cached = []
+            fit_data = self.fit_data
+            sleep_rows = self.sleep_metrics.get(date_str, [])
+            for w in self.workouts.get(date_str, []):
+                title = w.get('title') or w.get('Title')
+                combined = dict(w)
+                fit = fit_data.get((date_str, title))
+                if fit is not None:
+                    combined['fit_file_id'] = fit['fit_file_id']
+                    combined['fit_metrics'] = fit['fit_metrics']
+                # attach sleep metrics (if any)
+                combined['sleep_metrics'] = sleep_rows
+                cached.append(combined)
+            self._combined_cache[date_str] = cached
+        return [dict(row) for row in cached]
 
     def calculate_sleep_quality_score(self, metrics: Any) -> float:
         """Simple heuristic to compute a sleep quality score from metric row(s).
@@ -113,23 +161,22 @@ class MetricsProcessor:
         The summary includes per-day combined workout data and an average
         sleep quality score computed from the available sleep metrics.
         """
-        sd = datetime.fromisoformat(start_date).date()
-        ed = datetime.fromisoformat(end_date).date()
+        dates = pd.date_range(datetime.fromisoformat(start_date).date(),
+                              datetime.fromisoformat(end_date).date()).strftime('%Y-%m-%d').tolist()
 
-        cur = sd
+        # locals avoid repeated attribute lookups in the loop
+        workouts = self.workouts
+        scores_by_date = self.sleep_scores
         per_day = {}
         sleep_scores = []
 
-        while cur <= ed:
-            dstr = cur.isoformat()
-            combined = self.get_combined_workout_data(dstr)
-            per_day[dstr] = combined
-            # compute sleep quality for the day
-            rows = self.sleep_metrics.get(dstr, [])
-            if rows:
-                score = self.calculate_sleep_quality_score(rows)
+        for dstr in dates:
+            # only days with workouts need combining; the rest report an empty list
+            per_day[dstr] = self.get_combined_workout_data(dstr) if dstr in workouts else []
+            # sleep quality was scored at ingest
+            score = scores_by_date.get(dstr)
+            if score is not None:
                 sleep_scores.append(score)
-            cur += timedelta(days=1)
 
         avg_sleep = float(sum(sleep_scores) / len(sleep_scores)) if sleep_scores else 0.0
         return {
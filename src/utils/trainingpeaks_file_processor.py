@@ -7,13 +7,87 @@ Handles extraction and processing of TrainingPeaks export files:
 - Organizes files for import
 """
 
+import os
 import zipfile
+import zlib
 import gzip
 import shutil
-from pathlib import Path
-from typing import List, Dict, Tuple, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import List, Dict, Tuple, Any, Optional, Sequence
 from datetime import datetime, timedelta
 
+# python-isal's igzip is a faster drop-in for gzip.open when installed
+try:
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
+
+# Copy in 1 MiB blocks: far fewer read/write calls than shutil's 64 KiB default
+_COPY_BUFSIZE = 1 << 20
+
+# Written into an extraction directory once a ZIP has been fully extracted into it
+_EXTRACTED_MARKER = '.extracted_ok'
+
+# Name prefixes of the three TrainingPeaks export kinds
+_EXPORT_PREFIXES = ('WorkoutFileExport-', 'WorkoutExport-', 'MetricsExport-')
+
+
+def decompress_fit_gz(fit_gz_path: Path) -> Path:
+    """
+    Decompress a .fit.gz file to .fit format.
+
+    Args:
+        fit_gz_path: Path to .fit.gz file
+
+    Returns:
+        Path to decompressed .fit file
+    """
+    fit_path = fit_gz_path.with_suffix('')  # Remove .gz extension
+
+    # Repeat syncs of the same week find the .fit already decompressed; it is only
+    # stale if the .fit.gz was rewritten after it
+    try:
+        fit_stat = fit_path.stat()
+        if fit_stat.st_size > 0 and fit_stat.st_mtime >= fit_gz_path.stat().st_mtime:
+            return fit_path
+    except FileNotFoundError:
+        pass
+
+    # Decompress to a temporary name and rename, so an interrupted run never leaves a
+    # truncated .fit that the check above would accept.
+    # The large copy blocks make a second buffering layer on the output file pointless
+    tmp_path = fit_path.with_name(fit_path.name + '.part')
+    with _gzip.open(fit_gz_path, 'rb') as f_in:
+        with open(tmp_path, 'wb', buffering=0) as f_out:
+            shutil.copyfileobj(f_in, f_out, _COPY_BUFSIZE)
+    os.replace(tmp_path, fit_path)
+
+    return fit_path
+
+
+def _member_path(extract_path: Path, member_name: str) -> Optional[Path]:
+    """Map a ZIP member name to a path inside extract_path, dropping absolute and '..' parts"""
+    parts = [
+        part for part in PurePosixPath(member_name.replace('\\', '/')).parts
+        if part not in ('/', '.', '..') and not part.endswith(':')
+    ]
+    return extract_path.joinpath(*parts) if parts else None
+
+
+def _same_file_contents(path: Path, info: zipfile.ZipInfo) -> bool:
+    """True if path already holds exactly the data of ZIP member info (size and CRC-32)"""
+    try:
+        if path.stat().st_size != info.file_size:
+            return False
+        crc = 0
+        with open(path, 'rb') as f:
+            while block := f.read(_COPY_BUFSIZE):
+                crc = zlib.crc32(block, crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
 
 class TrainingPeaksFileProcessor:
     """Process TrainingPeaks export files."""
@@ -29,6 +103,9 @@ class TrainingPeaksFileProcessor:
         self.download_dir = Path(download_dir)
         self.extract_dir = Path(extract_dir)
         self.extract_dir.mkdir(parents=True, exist_ok=True)
+        # ZIP path -> result, so each export is unpacked at most once per processor
+        self._extracted: Dict[Path, Path] = {}
+        self._extracted_csv: Dict[Path, Path] = {}
     
     def extract_zip(self, zip_path: Path) -> Path:
         """
@@ -40,14 +117,84 @@ class TrainingPeaksFileProcessor:
         Returns:
             Path to extraction directory
         """
+        zip_path = Path(zip_path)
+        if zip_path in self._extracted:
+            return self._extracted[zip_path]
+        
         extract_path = self.extract_dir / zip_path.stem
         extract_path.mkdir(parents=True, exist_ok=True)
         
+        # Re-syncs see the same ZIP again; skip extraction if this exact file
+        # (same size and mtime) was already extracted here
+        zip_stat = zip_path.stat()
+        fingerprint = f"{zip_stat.st_size}:{zip_stat.st_mtime_ns}"
+        marker = extract_path / _EXTRACTED_MARKER
+        try:
+            if marker.read_text() == fingerprint:
+                self._extracted[zip_path] = extract_path
+                return extract_path
+        except OSError:
+            pass
+        
+        # Stream members straight to disk rather than through the general-purpose
+        # extractall; members already present with identical contents are left alone
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_path)
+            members = []
+            for info in zip_ref.infolist():
+                dest = _member_path(extract_path, info.filename)
+                if dest is not None:
+                    members.append((info, dest))
+            
+            # Create the directory tree once up front rather than per extracted file
+            dirs = {dest if info.is_dir() else dest.parent for info, dest in members}
+            for directory in sorted(dirs):
+                directory.mkdir(parents=True, exist_ok=True)
+            
+            for info, dest in members:
+                if info.is_dir():
+                    continue
+                if info.file_size == 0:
+                    dest.write_bytes(b'')
+                elif not _same_file_contents(dest, info):
+                    with zip_ref.open(info) as src, open(dest, 'wb', buffering=0) as dst:
+                        shutil.copyfileobj(src, dst, min(info.file_size, _COPY_BUFSIZE))
         
+        marker.write_text(fingerprint)
+        self._extracted[zip_path] = extract_path
         return extract_path
     
+    def extract_csv(self, zip_path: Path) -> Path:
+        """
+        Extract only the top-level CSV from an export ZIP.
+        
+        Args:
+            zip_path: Path to ZIP file
+            
+        Returns:
+            Path to extracted CSV file
+        """
+        zip_path = Path(zip_path)
+        if zip_path in self._extracted_csv:
+            return self._extracted_csv[zip_path]
+        
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            info = next(
+                (zi for zi in zip_ref.infolist()
+                 if zi.filename.endswith('.csv') and '/' not in zi.filename),
+                None,
+            )
+            if info is None:
+                raise FileNotFoundError(f"No CSV found in {zip_path}")
+            
+            csv_path = self.extract_dir / zip_path.stem / info.filename
+            if not _same_file_contents(csv_path, info):
+                csv_path.parent.mkdir(parents=True, exist_ok=True)
+                with zip_ref.open(info) as src, open(csv_path, 'wb', buffering=0) as dst:
+                    shutil.copyfileobj(src, dst, max(1, min(info.file_size, _COPY_BUFSIZE)))
+        
+        self._extracted_csv[zip_path] = csv_path
+        return csv_path
+    
     def decompress_fit_gz(self, fit_gz_path: Path) -> Path:
         """
         Decompress a .fit.gz file to .fit format.
@@ -58,13 +205,53 @@ class TrainingPeaksFileProcessor:
         Returns:
             Path to decompressed .fit file
         """
-        fit_path = fit_gz_path.with_suffix('')  # Remove .gz extension
+        return decompress_fit_gz(fit_gz_path)
+    
+    def find_fit_gz_files(self, root: Path) -> List[Path]:
+        """
+        Recursively find .fit.gz files under a directory.
+        
+        Uses os.scandir, whose entries carry their file type, instead of
+        Path.rglob, which stats each candidate again.
+        
+        Args:
+            root: Directory to search
+            
+        Returns:
+            List of paths to .fit.gz files
+        """
+        found = []
+        pending = [os.fspath(root)]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith('.fit.gz') and entry.is_file():
+                        found.append(Path(entry.path))
+        return found
+    
+    def decompress_fit_gz_files(self, fit_gz_files: Sequence[Path]) -> List[Path]:
+        """
+        Decompress many .fit.gz files in parallel.
+        
+        Each file inflates independently on a thread pool (one worker per
+        core); zlib releases the GIL while inflating. Threads rather than
+        processes, since this runs from the sync's prefetch thread inside the
+        Streamlit/Playwright host, where forking can inherit held locks.
         
-        with gzip.open(fit_gz_path, 'rb') as f_in:
-            with open(fit_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        Args:
+            fit_gz_files: Paths to .fit.gz files
+            
+        Returns:
+            Paths to decompressed .fit files, in input order
+        """
+        if not fit_gz_files:
+            return []
         
-        return fit_path
+        workers = min(len(fit_gz_files), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(decompress_fit_gz, fit_gz_files))
     
     def process_workout_files_export(self, zip_path: Path) -> List[Path]:
         """
@@ -80,15 +267,10 @@ class TrainingPeaksFileProcessor:
         extract_path = self.extract_zip(zip_path)
         
         # Find all .fit.gz files
-        fit_gz_files = list(extract_path.rglob('*.fit.gz'))
+        fit_gz_files = self.find_fit_gz_files(extract_path)
         
-        # Decompress each file
-        fit_files = []
-        for fit_gz in fit_gz_files:
-            fit_file = self.decompress_fit_gz(fit_gz)
-            fit_files.append(fit_file)
-        
-        return fit_files
+        # Decompress all files in parallel
+        return self.decompress_fit_gz_files(fit_gz_files)
     
     def process_workout_summary_export(self, zip_path: Path) -> Path:
         """
@@ -100,14 +282,7 @@ class TrainingPeaksFileProcessor:
         Returns:
             Path to extracted CSV file
         """
-        extract_path = self.extract_zip(zip_path)
-        
-        # Find the CSV file
-        csv_files = list(extract_path.glob('*.csv'))
-        if not csv_files:
-            raise FileNotFoundError(f"No CSV found in {zip_path}")
-        
-        return csv_files[0]
+        return self.extract_csv(zip_path)
     
     def process_metrics_export(self, zip_path: Path) -> Path:
         """
@@ -119,14 +294,7 @@ class TrainingPeaksFileProcessor:
         Returns:
             Path to extracted CSV file
         """
-        extract_path = self.extract_zip(zip_path)
-        
-        # Find the CSV file
-        csv_files = list(extract_path.glob('*.csv'))
-        if not csv_files:
-            raise FileNotFoundError(f"No CSV found in {zip_path}")
-        
-        return csv_files[0]
+        return self.extract_csv(zip_path)
     
     def process_all_exports(self, 
                            workout_files_zip: Path,
@@ -181,32 +349,32 @@ class TrainingPeaksFileProcessor:
             Tuple of (workout_files_zip, workout_summary_zip, metrics_zip)
         """
         # Pattern for exported files: *Export-Robinson-Jake-*.zip
-        workout_files = list(self.download_dir.glob('WorkoutFileExport-*.zip'))
-        workout_summaries = list(self.download_dir.glob('WorkoutExport-*.zip'))
-        metrics = list(self.download_dir.glob('MetricsExport-*.zip'))
-        
-        # Also check for directories (already extracted)
-        workout_dirs = list(self.download_dir.glob('WorkoutFileExport-*'))
-        workout_dirs = [d for d in workout_dirs if d.is_dir()]
-        
-        # Get most recent of each type (or None if not found)
-        workout_file = None
-        if workout_files:
-            workout_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            workout_file = workout_files[0]
-        elif workout_dirs:
-            workout_dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            workout_file = workout_dirs[0]
-        
-        workout_summary = None
-        if workout_summaries:
-            workout_summaries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            workout_summary = workout_summaries[0]
-        
-        metric = None
-        if metrics:
-            metrics.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            metric = metrics[0]
+        # One directory scan classifies everything (instead of a glob per pattern)
+        # DirEntry objects are kept (not Paths): each caches its stat result, so every
+        # candidate is stat'd at most once
+        zips: Dict[str, List[os.DirEntry]] = {prefix: [] for prefix in _EXPORT_PREFIXES}
+        workout_dirs: List[os.DirEntry] = []  # Also check for directories (already extracted)
+        with os.scandir(self.download_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                # One tuple startswith rejects the unrelated files in Downloads
+                if not name.startswith(_EXPORT_PREFIXES):
+                    continue
+                prefix = name[:name.index('-') + 1]
+                if name.endswith('.zip'):
+                    zips[prefix].append(entry)
+                if prefix == 'WorkoutFileExport-' and entry.is_dir():
+                    workout_dirs.append(entry)
+        
+        # Get most recent of each type (or None if not found); max() is one linear pass
+        def newest(candidates: List[os.DirEntry]) -> Optional[Path]:
+            if not candidates:
+                return None
+            return Path(max(candidates, key=lambda e: e.stat().st_mtime).path)
+        
+        workout_file = newest(zips['WorkoutFileExport-']) or newest(workout_dirs)
+        workout_summary = newest(zips['WorkoutExport-'])
+        metric = newest(zips['MetricsExport-'])
         
         return workout_file, workout_summary, metric
 
@@ -3,12 +3,20 @@ TrainingPeaks Automated Sync
 Standalone script that runs browser automation directly
 """
 
+import json
+import logging
+import mmap
 import os
+import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from hashlib import blake2b
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from playwright.sync_api import sync_playwright, Page
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from trainingpeaks_file_processor import TrainingPeaksFileProcessor
 import nest_asyncio
@@ -16,6 +24,36 @@ import nest_asyncio
 # Allow nested event loops (needed when running from Streamlit)
 nest_asyncio.apply()
 
+logger = logging.getLogger(__name__)
+
+# requests_toolbelt streams multipart bodies; without it requests builds the whole body in memory
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# blake3 (SIMD, multi-GB/s) fingerprints FIT files when installed; blake2b otherwise
+try:
+    from blake3 import blake3 as _fingerprint_hash
+except ImportError:
+    _fingerprint_hash = None
+
+# Content fingerprints of FIT files the API has accepted, per API base URL
+UPLOAD_MANIFEST_PATH = Path.home() / ".cache" / "fitness_tracker" / "uploaded_fit.json"
+
+
+def _file_fingerprint(path: Path) -> str:
+    """Hex content hash of a file, read through mmap"""
+    hasher = _fingerprint_hash() if _fingerprint_hash is not None else blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+    return hasher.hexdigest()
+
+# Concurrent FIT uploads (and pooled keep-alive connections) to the local API
+UPLOAD_WORKERS = 8
+
 
 class TrainingPeaksSync:
     """Automated sync from TrainingPeaks to local database"""
@@ -27,6 +65,33 @@ class TrainingPeaksSync:
         self.downloads_dir = Path.home() / "Downloads"
         self.extract_dir = Path.home() / "Downloads" / "trainingpeaks_extracted"
         self.api_base = "http://localhost:8000"
+        self._processor: Optional[TrainingPeaksFileProcessor] = None
+        # WorkoutFileExport ZIP path -> background extract/decompress of its FIT files
+        self._fit_prefetch: Dict[Path, "Future[List[Path]]"] = {}
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        # One keep-alive session for all uploads; the API is local, so skip proxy lookup
+        self._session = requests.Session()
+        self._session.trust_env = False
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=UPLOAD_WORKERS))
+        # fingerprint -> file name of FIT files already accepted by this API (loaded lazily)
+        self._uploaded_fit: Optional[Dict[str, str]] = None
+        # Upload every FIT file even if the manifest says the API already has it, e.g. after
+        # the database behind api_base was reset
+        self.force_upload = False
+    
+    def _get_processor(self) -> TrainingPeaksFileProcessor:
+        """Return the file processor, creating it on first use"""
+        if self._processor is None:
+            self._processor = TrainingPeaksFileProcessor(self.downloads_dir, self.extract_dir)
+        return self._processor
+    
+    def _start_fit_prefetch(self, zip_path: Path):
+        """Start extracting a saved WorkoutFileExport ZIP while the other downloads finish"""
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._fit_prefetch[zip_path] = self._prefetch_pool.submit(
+            self._get_processor().process_workout_files_export, zip_path
+        )
     
     def get_current_week_dates(self):
         """Get Monday to Sunday of current week"""
@@ -38,7 +103,7 @@ class TrainingPeaksSync:
     
     def login_and_navigate(self, page: Page):
         """Handle login and navigation to export page"""
-        print("🌐 Navigating to TrainingPeaks...")
+        logger.info("🌐 Navigating to TrainingPeaks...")
         page.goto("https://www.trainingpeaks.com")
         
         # Accept cookies if present
@@ -48,7 +113,7 @@ class TrainingPeaksSync:
             pass
         
         # Click login
-        print("🔐 Logging in...")
+        logger.info("🔐 Logging in...")
         page.click("a[href*='login']")
         page.wait_for_selector("input[name='Username']")
         
@@ -58,28 +123,39 @@ class TrainingPeaksSync:
         page.click("button[type='submit']")
         
         # Wait for potential captcha - give user 30 seconds
-        print("⏸️  Waiting for login to complete (solve captcha if it appears)...")
+        logger.info("⏸️  Waiting for login to complete (solve captcha if it appears)...")
         try:
             page.wait_for_selector("button:has-text('Calendar')", timeout=30000)
-            print("✅ Login successful!")
+            logger.info("✅ Login successful!")
         except:
-            print("❌ Login timeout - captcha may need to be solved manually")
-            print("   Waiting an additional 30 seconds...")
+            logger.warning("❌ Login timeout - captcha may need to be solved manually")
+            logger.info("   Waiting an additional 30 seconds...")
             time.sleep(30)
         
         # Navigate to Settings
-        print("⚙️  Navigating to Settings...")
+        logger.info("⚙️  Navigating to Settings...")
         page.click("button:has-text('Calendar')")
         page.click("p.MuiTypography-root:has-text('Jake Robinson')")
         page.click("label.userSettingsOption:has-text('Settings')")
         
         # Wait for export page
         page.wait_for_selector("input.datepicker.startDate", timeout=10000)
-        print("✅ Export page loaded")
+        logger.info("✅ Export page loaded")
+    
+    def _wait_for_links(self, page: Page, condition: str, timeout_ms: int) -> bool:
+        """Wait until a JS condition on the download-link count (``n``) holds; False on timeout"""
+        try:
+            page.wait_for_function(
+                f"() => {{ const n = document.querySelectorAll('a#userConfirm').length; return {condition}; }}",
+                timeout=timeout_ms,
+            )
+            return True
+        except Exception:
+            return False
     
     def export_data(self, page: Page, start_date: str, end_date: str):
         """Fill dates and trigger exports"""
-        print(f"📅 Setting date range: {start_date} to {end_date}")
+        logger.info("📅 Setting date range: %s to %s", start_date, end_date)
         
         # Fill all date fields using JavaScript
         page.evaluate(f"""
@@ -97,22 +173,17 @@ class TrainingPeaksSync:
             }});
         """)
         
-        print("📥 Triggering exports...")
-        
-        # Click first export button (Workout Files)
-        page.evaluate("document.querySelectorAll('button.download.tpSecondaryButton')[0].click()")
-        time.sleep(2)
+        logger.info("📥 Triggering exports...")
         
-        # Click second export button (Workout Summary)
-        page.evaluate("document.querySelectorAll('button.download.tpSecondaryButton')[1].click()")
-        time.sleep(2)
-        
-        # Click third export button (Custom Metrics)
-        page.evaluate("document.querySelectorAll('button.download.tpSecondaryButton')[2].click()")
-        time.sleep(3)
+        # Click the export buttons (Workout Files, Workout Summary, Custom Metrics) in turn.
+        # After each click, move on as soon as its download link appears instead of after a
+        # fixed sleep; the old sleep lengths are kept as upper bounds
+        for index, max_wait_ms in enumerate((2000, 2000, 3000)):
+            page.evaluate(f"document.querySelectorAll('button.download.tpSecondaryButton')[{index}].click()")
+            self._wait_for_links(page, f"n >= {index + 1}", timeout_ms=max_wait_ms)
         
         # Hide datepicker overlay
-        print("💾 Starting downloads...")
+        logger.info("💾 Starting downloads...")
         page.evaluate("""
             document.getElementById('ui-datepicker-div').style.display = 'none';
         """)
@@ -126,7 +197,7 @@ class TrainingPeaksSync:
                 # Check if any links are available
                 num_links = page.evaluate("document.querySelectorAll('a#userConfirm').length")
                 if num_links == 0:
-                    print(f"   No more download links available")
+                    logger.info("   No more download links available")
                     break
                 
                 # Always click the first link [0] since the array updates after each download
@@ -134,16 +205,16 @@ class TrainingPeaksSync:
                     page.evaluate("document.querySelectorAll('a#userConfirm')[0].click()")
                 download = download_info.value
                 downloads.append(download)
-                print(f"   📥 Download {attempt+1} started: {download.suggested_filename}")
+                logger.info("   📥 Download %d started: %s", attempt+1, download.suggested_filename)
                 
-                # Small delay to let dialog close before checking for next link
-                time.sleep(0.5)
+                # Let the dialog close (its link disappears) before checking for the next link
+                self._wait_for_links(page, f"n < {num_links}", timeout_ms=500)
                 
             except Exception as e:
-                print(f"   ⚠️ Download {attempt+1} failed: {e}")
+                logger.warning("   ⚠️ Download %d failed: %s", attempt+1, e)
                 # Continue trying in case there are more links
         
-        print("⏳ Saving downloads...")
+        logger.info("⏳ Saving downloads...")
         
         # Save downloads with proper filenames
         saved_files = []
@@ -153,27 +224,86 @@ class TrainingPeaksSync:
                 save_path = self.downloads_dir / suggested_name
                 download.save_as(save_path)
                 saved_files.append(save_path)
-                print(f"   ✅ Saved: {suggested_name}")
+                logger.info("   ✅ Saved: %s", suggested_name)
+                # The FIT export is saved first; unpack it while the CSV exports are still saving
+                if suggested_name.startswith('WorkoutFileExport-') and suggested_name.endswith('.zip'):
+                    self._start_fit_prefetch(save_path)
             except Exception as e:
-                print(f"   ❌ Failed to save: {e}")
+                logger.error("   ❌ Failed to save: %s", e)
+        
+        logger.info("✅ Downloaded and saved %d files!", len(saved_files))
+    
+    def _post_file(self, endpoint: str, upload_name: str, path: Path, content_type: str) -> requests.Response:
+        """POST a file to /upload/<endpoint> as the multipart 'file' field"""
+        url = f"{self.api_base}/upload/{endpoint}"
+        with open(path, 'rb') as f:
+            if MultipartEncoder is None or os.fstat(f.fileno()).st_size == 0:
+                return self._session.post(url, files={'file': (upload_name, f, content_type)})
+            # Stream the body straight from the page cache instead of copying the file into it
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoder = MultipartEncoder(fields={'file': (upload_name, mm, content_type)})
+                return self._session.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+    
+    def _load_upload_manifest(self) -> Dict[str, str]:
+        """Return the fingerprints of FIT files this API already accepted"""
+        if self._uploaded_fit is None:
+            try:
+                with open(UPLOAD_MANIFEST_PATH, encoding="utf-8") as f:
+                    saved = json.load(f)
+            except (OSError, ValueError):
+                saved = {}
+            entries = saved.get(self.api_base) if isinstance(saved, dict) else None
+            self._uploaded_fit = entries if isinstance(entries, dict) else {}
+        return self._uploaded_fit
+    
+    def _save_upload_manifest(self):
+        """Write this API's upload fingerprints back to disk, keeping other APIs' entries"""
+        try:
+            with open(UPLOAD_MANIFEST_PATH, encoding="utf-8") as f:
+                saved = json.load(f)
+            if not isinstance(saved, dict):
+                saved = {}
+        except (OSError, ValueError):
+            saved = {}
+        saved[self.api_base] = self._uploaded_fit or {}
+        try:
+            UPLOAD_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = UPLOAD_MANIFEST_PATH.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, UPLOAD_MANIFEST_PATH)
+        except OSError as e:
+            logger.warning("Could not save upload manifest: %s", e)
+    
+    def _upload_fit(self, fit_file: Path) -> Tuple[str, Optional[requests.Response]]:
+        """
+        Upload a single FIT file to the API unless identical content was already accepted
+        (always uploaded when force_upload is set).
         
-        print(f"✅ Downloaded and saved {len(saved_files)} files!")
+        Returns the file's fingerprint and the response (None when skipped).
+        """
+        fingerprint = _file_fingerprint(fit_file)
+        if not self.force_upload and fingerprint in self._load_upload_manifest():
+            return fingerprint, None
+        return fingerprint, self._post_file('fit', fit_file.name, fit_file, 'application/octet-stream')
     
     def process_and_upload_files(self):
         """Process downloaded files and upload to database"""
-        print("\n📦 Processing downloaded files...")
+        logger.info("📦 Processing downloaded files...")
         
-        processor = TrainingPeaksFileProcessor(self.downloads_dir, self.extract_dir)
+        processor = self._get_processor()
         
         # Find the latest files - returns tuple of (workout_files, workout_summary, metrics)
         workout_files_path, workout_summary_path, metrics_path = processor.find_latest_exports()
         
         if not workout_files_path and not workout_summary_path and not metrics_path:
-            print("❌ No export files found in Downloads folder")
-            return {'fit_files': 0, 'workouts': False, 'metrics': False, 'errors': ['No files found']}
+            logger.error("❌ No export files found in Downloads folder")
+            return {'fit_files': 0, 'fit_files_skipped': 0, 'workouts': False, 'metrics': False,
+                    'errors': ['No files found']}
         
         results = {
             'fit_files': 0,
+            'fit_files_skipped': 0,
             'workouts': False,
             'metrics': False,
             'errors': []
@@ -181,101 +311,112 @@ class TrainingPeaksSync:
         
         # Process FIT files
         if workout_files_path:
-            print(f"📦 Processing FIT files from {workout_files_path.name}...")
+            logger.info("📦 Processing FIT files from %s...", workout_files_path.name)
             try:
                 # Check if it's a directory or ZIP
                 if workout_files_path.is_dir():
                     # Already extracted - find .fit.gz files directly
-                    fit_gz_files = list(workout_files_path.rglob('*.fit.gz'))
-                    fit_files = []
-                    for fit_gz in fit_gz_files:
-                        fit_file = processor.decompress_fit_gz(fit_gz)
-                        fit_files.append(fit_file)
+                    fit_gz_files = processor.find_fit_gz_files(workout_files_path)
+                    fit_files = processor.decompress_fit_gz_files(fit_gz_files)
                 else:
-                    # It's a ZIP - use the processor method
-                    fit_files = processor.process_workout_files_export(workout_files_path)
+                    # It's a ZIP - use the background result if export_data started one
+                    prefetch = self._fit_prefetch.pop(workout_files_path, None)
+                    if prefetch is not None:
+                        fit_files = prefetch.result()
+                    else:
+                        fit_files = processor.process_workout_files_export(workout_files_path)
                 
-                print(f"   Found {len(fit_files)} FIT files")
+                logger.info("   Found %d FIT files", len(fit_files))
                 
-                # Upload each FIT file
-                for fit_file in fit_files:
-                    try:
-                        with open(fit_file, 'rb') as f:
-                            files_payload = {'file': (Path(fit_file).name, f, 'application/octet-stream')}
-                            response = requests.post(f"{self.api_base}/upload/fit", files=files_payload)
-                            if response.status_code == 200:
+                # Upload the FIT files concurrently; results are reported as they finish.
+                # Files whose content the API already accepted are skipped
+                uploaded = self._load_upload_manifest()
+                newly_uploaded = 0
+                with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+                    futures = {executor.submit(self._upload_fit, f): f for f in fit_files}
+                    for future in as_completed(futures):
+                        fit_file = futures[future]
+                        name = fit_file.name  # fit_files are already Paths
+                        try:
+                            fingerprint, response = future.result()
+                            if response is None:
+                                results['fit_files_skipped'] += 1
+                                logger.info("   ⏭️  Already uploaded %s", name)
+                            elif response.status_code == 200:
                                 results['fit_files'] += 1
-                                print(f"   ✅ Uploaded {Path(fit_file).name}")
+                                uploaded[fingerprint] = name
+                                newly_uploaded += 1
+                                logger.info("   ✅ Uploaded %s", name)
                             else:
-                                print(f"   ❌ Failed to upload {Path(fit_file).name}: {response.status_code}")
-                                results['errors'].append(f"FIT upload failed: {Path(fit_file).name}")
-                    except Exception as e:
-                        print(f"   ❌ Error uploading {fit_file}: {str(e)}")
-                        results['errors'].append(f"FIT error: {str(e)}")
+                                logger.error("   ❌ Failed to upload %s: %s", name, response.status_code)
+                                results['errors'].append(f"FIT upload failed: {name}")
+                        except Exception as e:
+                            logger.error("   ❌ Error uploading %s: %s", fit_file, e)
+                            results['errors'].append(f"FIT error: {str(e)}")
+                if newly_uploaded:
+                    self._save_upload_manifest()
+                # Totals after the per-file lines
+                logger.info("   ✅ Uploaded %d of %d FIT files (%d already uploaded)",
+                            results['fit_files'], len(fit_files), results['fit_files_skipped'])
             except Exception as e:
-                print(f"❌ Error processing FIT files: {str(e)}")
+                logger.error("❌ Error processing FIT files: %s", e)
                 results['errors'].append(f"FIT processing error: {str(e)}")
         
         # Upload workouts CSV
         if workout_summary_path:
-            print(f"📤 Uploading {workout_summary_path.name}...")
+            logger.info("📤 Uploading %s...", workout_summary_path.name)
             try:
                 # Extract if it's a ZIP
                 if workout_summary_path.suffix == '.zip':
-                    extracted_dir = processor.extract_zip(workout_summary_path)
-                    csv_files = list(Path(extracted_dir).glob('*.csv'))
-                    if csv_files:
-                        csv_path = csv_files[0]
-                    else:
-                        raise FileNotFoundError("No CSV found in WorkoutExport ZIP")
+                    csv_path = processor.extract_csv(workout_summary_path)
                 else:
                     csv_path = workout_summary_path
                 
-                with open(csv_path, 'rb') as f:
-                    files_payload = {'file': ('workouts.csv', f, 'text/csv')}
-                    response = requests.post(f"{self.api_base}/upload/workouts", files=files_payload)
-                    if response.status_code == 200:
-                        print("   ✅ Workouts uploaded successfully")
-                        results['workouts'] = True
-                    else:
-                        print(f"   ❌ Failed: {response.status_code}")
-                        results['errors'].append(f"Workouts upload failed: {response.status_code}")
+                response = self._post_file('workouts', 'workouts.csv', csv_path, 'text/csv')
+                if response.status_code == 200:
+                    logger.info("   ✅ Workouts uploaded successfully")
+                    results['workouts'] = True
+                else:
+                    logger.error("   ❌ Failed: %s", response.status_code)
+                    results['errors'].append(f"Workouts upload failed: {response.status_code}")
             except Exception as e:
-                print(f"❌ Error uploading workouts: {str(e)}")
+                logger.error("❌ Error uploading workouts: %s", e)
                 results['errors'].append(f"Workouts error: {str(e)}")
         
         # Upload metrics CSV
         if metrics_path:
-            print(f"📤 Uploading {metrics_path.name}...")
+            logger.info("📤 Uploading %s...", metrics_path.name)
             try:
                 # Extract if it's a ZIP
                 if metrics_path.suffix == '.zip':
-                    extracted_dir = processor.extract_zip(metrics_path)
-                    csv_files = list(Path(extracted_dir).glob('*.csv'))
-                    if csv_files:
-                        csv_path = csv_files[0]
-                    else:
-                        raise FileNotFoundError("No CSV found in MetricsExport ZIP")
+                    csv_path = processor.extract_csv(metrics_path)
                 else:
                     csv_path = metrics_path
                 
-                with open(csv_path, 'rb') as f:
-                    files_payload = {'file': ('metrics.csv', f, 'text/csv')}
-                    response = requests.post(f"{self.api_base}/upload/metrics", files=files_payload)
-                    if response.status_code == 200:
-                        print("   ✅ Metrics uploaded successfully")
-                        results['metrics'] = True
-                    else:
-                        print(f"   ❌ Failed: {response.status_code}")
-                        results['errors'].append(f"Metrics upload failed: {response.status_code}")
+                response = self._post_file('metrics', 'metrics.csv', csv_path, 'text/csv')
+                if response.status_code == 200:
+                    logger.info("   ✅ Metrics uploaded successfully")
+                    results['metrics'] = True
+                else:
+                    logger.error("   ❌ Failed: %s", response.status_code)
+                    results['errors'].append(f"Metrics upload failed: {response.status_code}")
             except Exception as e:
-                print(f"❌ Error uploading metrics: {str(e)}")
+                logger.error("❌ Error uploading metrics: %s", e)
                 results['errors'].append(f"Metrics error: {str(e)}")
         
         return results
     
-    def run_sync(self, start_date=None, end_date=None):
-        """Run the complete sync process"""
+    def run_sync(self, start_date=None, end_date=None, force_upload: bool = False):
+        """
+        Run the complete sync process.
+        
+        force_upload re-sends FIT files the upload manifest records as already accepted,
+        for when the API's database was reset or recreated.
+        
+        Progress is reported at INFO on this module's logger; library callers that want it
+        on the console attach a handler (the __main__ block and the Streamlit page do).
+        """
+        self.force_upload = force_upload
         # Get dates
         if start_date is None or end_date is None:
             start_date, end_date = self.get_current_week_dates()
@@ -283,12 +424,12 @@ class TrainingPeaksSync:
         start_str = start_date.strftime("%m/%d/%Y")
         end_str = end_date.strftime("%m/%d/%Y")
         
-        print("=" * 60)
-        print("🚀 TrainingPeaks Automated Sync")
-        print("=" * 60)
-        print(f"📅 Date Range: {start_str} to {end_str}")
-        print(f"👤 User: {self.username}")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("🚀 TrainingPeaks Automated Sync")
+        logger.info("=" * 60)
+        logger.info("📅 Date Range: %s to %s", start_str, end_str)
+        logger.info("👤 User: %s", self.username)
+        logger.info("=" * 60)
         
         try:
             with sync_playwright() as p:
@@ -307,27 +448,28 @@ class TrainingPeaksSync:
             # Process and upload files
             results = self.process_and_upload_files()
             
-            print("\n" + "=" * 60)
-            print("✅ SYNC COMPLETE!")
-            print("=" * 60)
-            print(f"FIT Files Uploaded: {results['fit_files']}")
-            print(f"Workouts CSV: {'✅' if results['workouts'] else '❌'}")
-            print(f"Metrics CSV: {'✅' if results['metrics'] else '❌'}")
+            logger.info("=" * 60)
+            logger.info("✅ SYNC COMPLETE!")
+            logger.info("=" * 60)
+            logger.info("FIT Files Uploaded: %d", results['fit_files'])
+            if results['fit_files_skipped']:
+                logger.info("FIT Files Already Uploaded: %d", results['fit_files_skipped'])
+            logger.info("Workouts CSV: %s", '✅' if results['workouts'] else '❌')
+            logger.info("Metrics CSV: %s", '✅' if results['metrics'] else '❌')
             if results['errors']:
-                print(f"Errors: {len(results['errors'])}")
+                logger.info("Errors: %d", len(results['errors']))
                 for error in results['errors']:
-                    print(f"  - {error}")
-            print("=" * 60)
+                    logger.info("  - %s", error)
+            logger.info("=" * 60)
             
             return results
             
         except Exception as e:
-            print(f"\n❌ Sync failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Sync failed: %s", e)
             return None
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     sync = TrainingPeaksSync()
-    sync.run_sync()
+    sync.run_sync(force_upload="--force-upload" in sys.argv[1:])
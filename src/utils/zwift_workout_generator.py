@@ -1,13 +1,46 @@
+import io
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional, Set
+from xml.sax.saxutils import escape
+import logging
 import random
+import re
 from .dynamic_workout_content import dynamic_content
 
+logger = logging.getLogger(__name__)
+
 # Default user FTP in watts - adjust this as your fitness changes
 DEFAULT_FTP = 258
 
+# Characters replaced with '_' in file names; \w is Unicode-aware, matching str.isalnum() plus '_'
+_FILENAME_UNSAFE_RE = re.compile(r'[^\w-]')
+
+# Extra entities for text placed inside double-quoted XML attributes
+_ATTR_ENTITIES = {'"': '&quot;'}
+
+# Fixed parts of a .zwo file; intervals are written between header and closing message
+_ZWO_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<workout_file>
+  <author/>
+  <name>{name}</name>
+  <description>{description}</description>
+  <sportType>bike</sportType>
+  <durationType>time</durationType>
+  <tags/>
+  <workout>
+    <!-- Welcome message -->
+    <textevent timeoffset="5" message="{welcome}"/>
+    <textevent timeoffset="15" message="{encouragement}"/>
+    <!-- Daily special content -->
+    <textevent timeoffset="25" message="{daily_special}"/>"""
+_ZWO_FOOTER = """
+    <textevent timeoffset="10" message="{closing}"/>
+  </workout>
+</workout_file>"""
+
 def get_random_text_alert(workout_type: str = "general", interval_name: str = "", duration: int = 0) -> str:
     """Get a dynamic entertaining text alert based on context"""
     return dynamic_content.get_fresh_content("general", workout_type, interval_name, duration)
@@ -26,17 +59,12 @@ def calculate_power(power_target: Dict[str, Any], ftp: int) -> float:
     if not isinstance(power_target, dict):
         return 0.5  # Default to 50% FTP if format is unknown
     
-    print(f"DEBUG: calculate_power called with power_target={power_target}, ftp={ftp}")
-    
+    result = 0.5  # Default to 50% FTP if format is unknown
     if 'type' in power_target:
         if power_target['type'] == 'percent_ftp':
             result = float(power_target.get('value', 50)) / 100.0
-            print(f"DEBUG: percent_ftp calculation: {power_target.get('value', 50)}/100 = {result}")
-            return result
         elif power_target['type'] == 'watts':
             result = float(power_target.get('value', 125)) / ftp
-            print(f"DEBUG: watts calculation: {power_target.get('value', 125)}/{ftp} = {result}")
-            return result
         elif power_target['type'] == 'range':
             # For range type, use the min value as the target
             # Check if this is already in watts or needs FTP conversion
@@ -44,35 +72,87 @@ def calculate_power(power_target: Dict[str, Any], ftp: int) -> float:
             unit = power_target.get('unit', 'percent_ftp')
             if unit == 'watts':
                 result = min_power / ftp  # Convert watts to fraction of FTP
-                print(f"DEBUG: range watts calculation: {min_power}/{ftp} = {result}")
-                return result
             else:
                 result = min_power / 100.0  # Assume percentage if no unit specified
-                print(f"DEBUG: range percent calculation: {min_power}/100 = {result}")
-                return result
     elif 'min' in power_target and 'max' in power_target:
         # Handle direct min/max format with unit specification
         min_power = float(power_target.get('min', 125))
         unit = power_target.get('unit', 'percent_ftp')
         if unit == 'watts':
             result = min_power / ftp  # Convert watts to fraction of FTP
-            print(f"DEBUG: direct min/max watts calculation: {min_power}/{ftp} = {result}")
-            return result
         else:
             result = min_power / 100.0  # Assume percentage
-            print(f"DEBUG: direct min/max percent calculation: {min_power}/100 = {result}")
-            return result
     elif 'value' in power_target:
         result = float(power_target['value']) / ftp
-        print(f"DEBUG: value calculation: {power_target['value']}/{ftp} = {result}")
-        return result
     
-    print("DEBUG: No matching power format, using default 0.5")
-    return 0.5  # Default to 50% FTP if format is unknown
+    # One guarded log call; the hot path pays a single level check
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("calculate_power(%s, ftp=%s) = %s", power_target, ftp, result)
+    return result
+
+def interval_power(power_target: Any, ftp: int) -> Tuple[str, float, float]:
+    """
+    Resolve an interval's power target once into its Zwift element and FTP fractions.
+    
+    Args:
+        power_target: The interval's powerTarget value
+        ftp: FTP value in watts
+        
+    Returns:
+        Tuple of (element, low, high): element is 'Ramp' or 'SteadyState'; for a
+        steady state low == high
+    """
+    if isinstance(power_target, dict):
+        if 'start' in power_target and 'end' in power_target:
+            # Ramp interval
+            return ('Ramp', calculate_power(power_target['start'], ftp),
+                    calculate_power(power_target['end'], ftp))
+        if 'min' in power_target and 'max' in power_target:
+            # Range target - steady state when min == max, otherwise ramp from min to max
+            min_power = float(power_target.get('min', 125))
+            max_power = float(power_target.get('max', 125))
+            unit = power_target.get('unit', 'percent_ftp')
+            
+            if unit == 'watts':
+                # Convert watts to fraction of FTP
+                min_fraction = min_power / ftp
+                max_fraction = max_power / ftp
+            else:
+                # Assume percentage
+                min_fraction = min_power / 100.0
+                max_fraction = max_power / 100.0
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("interval_power range - %s-%s %s at ftp=%s -> %s-%s",
+                             min_power, max_power, unit, ftp, min_fraction, max_fraction)
+            
+            if min_power == max_power:
+                return 'SteadyState', min_fraction, min_fraction
+            return 'Ramp', min_fraction, max_fraction
+    
+    # Steady state interval (also the default if the power format is unknown)
+    power = calculate_power(power_target, ftp)  # Already a decimal
+    return 'SteadyState', power, power
+
+@lru_cache(maxsize=512)
+def _parse_workout_date(workout_date: str) -> Tuple[datetime, str, str, int]:
+    """
+    Parse a YYYY-MM-DD workout date and derive the strings used for its file.
+    
+    Args:
+        workout_date: Date of the workout in YYYY-MM-DD format
+        
+    Returns:
+        Tuple of (date object, "YYYY_MM_DD" file prefix, "MM/DD" display date, ISO week)
+    """
+    date_obj = datetime.strptime(workout_date, "%Y-%m-%d")
+    return (date_obj, date_obj.strftime("%Y_%m_%d"), date_obj.strftime('%m/%d'),
+            date_obj.isocalendar()[1])
 
 def generate_zwift_workout(workout_date: str, workout_name: str, intervals: List[Dict[str, Any]], 
                           description: str = "", ftp: int = DEFAULT_FTP, output_dir: Optional[str] = None, 
-                          week_number: Optional[int] = None) -> str:
+                          week_number: Optional[int] = None,
+                          created_dirs: Optional[Set[str]] = None) -> str:
     """
     Generate a Zwift .zwo file from intervals data.
     
@@ -84,25 +164,28 @@ def generate_zwift_workout(workout_date: str, workout_name: str, intervals: List
         ftp: FTP value in watts to use for calculations (default: 258)
         output_dir: Directory to save the .zwo file (defaults to current working directory)
         week_number: Optional week number for folder naming (defaults to ISO week of year)
+        created_dirs: Optional set of weekly folders already created by a batch caller;
+            the folder is only created when missing from it, then added
         
     Returns:
         Path to the generated .zwo file
     """
-    print(f"DEBUG: Starting workout generation for {workout_name} on {workout_date}")
-    print(f"DEBUG: Number of intervals: {len(intervals)}")
+    logger.debug("Starting workout generation for %s on %s", workout_name, workout_date)
+    logger.debug("Number of intervals: %d", len(intervals))
+    
+    # Start fetching quotes in the background while the workout is assembled
+    dynamic_content.prefetch_quotes()
     
     # Parse the date for filename and folder organization
     try:
-        workout_date_obj = datetime.strptime(workout_date, "%Y-%m-%d")
-        date_prefix = workout_date_obj.strftime("%Y_%m_%d")
+        workout_date_obj, date_prefix, formatted_date, week_of_year = \
+            _parse_workout_date(workout_date)
         
         # Make sure the date is correct and properly formatted in the workout name
-        formatted_date = workout_date_obj.strftime('%m/%d')
         display_name = f"{formatted_date} {workout_name}"
         
         # Clean workout name for filename
-        clean_name = ''.join(c if c.isalnum() or c in ' -_' else '_' for c in workout_name)
-        clean_name = clean_name.replace(' ', '_')
+        clean_name = _FILENAME_UNSAFE_RE.sub('_', workout_name)
         
         # Create filename
         filename = f"{date_prefix}_{clean_name}.zwo"
@@ -115,22 +198,27 @@ def generate_zwift_workout(workout_date: str, workout_name: str, intervals: List
         if week_number is not None:
             week_folder = f"Week_{week_number}"
         else:
-            week_of_year = workout_date_obj.isocalendar()[1]
             week_folder = f"Week_{week_of_year}"
         weekly_output_dir = os.path.join(output_dir, week_folder)
         
-        # Create the weekly directory if it doesn't exist
-        os.makedirs(weekly_output_dir, exist_ok=True)
+        # Create the weekly directory if it doesn't exist (once per batch via created_dirs)
+        if created_dirs is None or weekly_output_dir not in created_dirs:
+            os.makedirs(weekly_output_dir, exist_ok=True)
+            if created_dirs is not None:
+                created_dirs.add(weekly_output_dir)
         
         # Full path for the output file
         output_path = os.path.join(weekly_output_dir, filename)
         
-        print(f"DEBUG: Output path: {output_path}")
+        logger.debug("Output path: %s", output_path)
+        
+        # Resolve every interval's power once; the description and the XML both use it
+        powers = [interval_power(interval.get('powerTarget', {}), ftp) for interval in intervals]
         
         # Generate a more detailed description if none provided
         if not description:
             description = f"{workout_name} - {formatted_date}\n"
-            for interval in intervals:
+            for interval, power in zip(intervals, powers):
                 interval_name = interval.get('name', '')
                 duration = interval.get('duration', 0)
                 power_target = interval.get('powerTarget', {})
@@ -139,7 +227,7 @@ def generate_zwift_workout(workout_date: str, workout_name: str, intervals: List
                 # Add interval details to description
                 description += f"\n{interval_name}: {duration//60}min"
                 if power_target:
-                    power_str = format_power_target(power_target, ftp)
+                    power_str = format_power_target(power_target, ftp, power)
                     description += f" @ {power_str}"
                 if cadence_target:
                     cadence_min = cadence_target.get('min')
@@ -147,159 +235,107 @@ def generate_zwift_workout(workout_date: str, workout_name: str, intervals: List
                     if cadence_min and cadence_max:
                         description += f" ({cadence_min}-{cadence_max} RPM)"
         
-        # Start building the XML content with the correct name tag
-        xml_content = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<workout_file>',
-            '  <author/>',
-            f'  <name>{display_name}</name>',
-            f'  <description>{description}</description>',
-            '  <sportType>bike</sportType>',
-            '  <durationType>time</durationType>',
-            '  <tags/>',
-            '  <workout>',
-            '    <!-- Welcome message -->',
-            '    <textevent timeoffset="5" message="' + dynamic_content.get_fresh_content("welcome") + '"/>',
-            '    <textevent timeoffset="15" message="' + dynamic_content.get_fresh_content("encouragement") + '"/>',
-            '    <!-- Daily special content -->',
-            '    <textevent timeoffset="25" message="' + dynamic_content.get_fresh_content("daily_special", workout_date=workout_date_obj) + '"/>'
-        ]
+        # Build the XML in one buffer, starting with the header and the correct name tag
+        xml_content = io.StringIO()
+        xml_content.write(_ZWO_HEADER.format(
+            name=escape(display_name),
+            description=escape(description),
+            welcome=xml_attr(dynamic_content.get_fresh_content("welcome")),
+            encouragement=xml_attr(dynamic_content.get_fresh_content("encouragement")),
+            daily_special=xml_attr(
+                dynamic_content.get_fresh_content("daily_special", workout_date=workout_date_obj)
+            ),
+        ))
         
         # Reset used messages for fresh workout content
         dynamic_content.reset_used_messages()
         
         # Process intervals
-        print(f"DEBUG: Using FTP: {ftp}W for workout generation")
-        for interval in intervals:
-            print(f"DEBUG: Processing interval: {interval.get('name', 'unnamed')}")
-            interval_type, xml_element = convert_interval_to_zwift(interval, ftp)
+        logger.debug("Using FTP: %sW for workout generation", ftp)
+        for interval, power in zip(intervals, powers):
+            logger.debug("Processing interval: %s", interval.get('name', 'unnamed'))
+            interval_type, xml_element = convert_interval_to_zwift(interval, ftp, power)
             if xml_element:
-                xml_content.append(f'    {xml_element}')
+                xml_content.write('\n    ')
+                xml_content.write(xml_element)
         
-        # Add motivational closing message
-        chosen_closing = dynamic_content.get_fresh_content("closing")
-        xml_content.append(f'    <textevent timeoffset="10" message="{chosen_closing}"/>')
+        # Add motivational closing message and close the XML
+        xml_content.write(_ZWO_FOOTER.format(
+            closing=xml_attr(dynamic_content.get_fresh_content("closing"))
+        ))
         
-        # Close the XML
-        xml_content.extend([
-            '  </workout>',
-            '</workout_file>'
-        ])
+        # Write the file as UTF-8 to match the XML declaration, in one unbuffered write
+        with open(output_path, 'wb', buffering=0) as f:
+            f.write(xml_content.getvalue().encode('utf-8'))
         
-        # Write the file
-        with open(output_path, 'w') as f:
-            f.write('\n'.join(xml_content))
-        
-        print(f"Generated Zwift workout file at: {output_path}")
+        logger.info("Generated Zwift workout file at: %s", output_path)
         return output_path
         
     except Exception as e:
-        print(f"ERROR in generate_zwift_workout: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in generate_zwift_workout: %s", e)
         raise
 
-def fix_xml_tag_in_file(file_path: str) -> None:
+def xml_attr(text: Any) -> str:
     """
-    Fix the XML tag issue in the generated file by replacing <n> with <name>.
+    Escape text for use inside a double-quoted XML attribute value.
     
     Args:
-        file_path: Path to the ZWO file to fix
-    """
-    try:
-        # Read the file content
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Replace <n> tags with <name> tags
-        content = content.replace('<n>', '<name>').replace('</n>', '</name>')
+        text: Value to escape (converted to str)
         
-        # Write the fixed content back
-        with open(file_path, 'w') as f:
-            f.write(content)
-    except Exception as e:
-        print(f"Warning: Could not fix XML tag in {file_path}: {str(e)}")
+    Returns:
+        Escaped string safe to place between double quotes
+    """
+    return escape(str(text), _ATTR_ENTITIES)
 
-def convert_interval_to_zwift(interval: Dict[str, Any], ftp: int) -> Tuple[str, str]:
+def convert_interval_to_zwift(interval: Dict[str, Any], ftp: int,
+                              power: Optional[Tuple[str, float, float]] = None) -> Tuple[str, str]:
     """
     Convert an interval dictionary to Zwift XML format.
     
     Args:
         interval: Dictionary containing interval data
         ftp: FTP value in watts for power calculations
+        power: Optional precomputed interval_power() result for this interval
         
     Returns:
         Tuple of (interval_type, xml_element)
     """
     interval_type = interval.get('name', '')
     duration = interval.get('duration', 0)
-    power_target = interval.get('powerTarget', {})
     cadence_target = interval.get('cadenceTarget', {})
     
-    # Handle different power target formats
-    if isinstance(power_target, dict):
-        if 'start' in power_target and 'end' in power_target:
-            # Ramp interval
-            start_power = calculate_power(power_target['start'], ftp)  # Already a decimal
-            end_power = calculate_power(power_target['end'], ftp)  # Already a decimal
-            xml_element = f'<Ramp Duration="{duration}" PowerLow="{start_power}" PowerHigh="{end_power}" pace="0"'
-        elif 'min' in power_target and 'max' in power_target:
-            # Range target - use min for steady state (could be enhanced to ramp if min != max)
-            min_power = float(power_target.get('min', 125))
-            max_power = float(power_target.get('max', 125))
-            unit = power_target.get('unit', 'percent_ftp')
-            
-            print(f"DEBUG: convert_interval_to_zwift range - min_power={min_power}, max_power={max_power}, unit={unit}, ftp={ftp}")
-            
-            if unit == 'watts':
-                # Convert watts to fraction of FTP
-                min_fraction = min_power / ftp
-                max_fraction = max_power / ftp
-                print(f"DEBUG: watts conversion - {min_power}/{ftp}={min_fraction}, {max_power}/{ftp}={max_fraction}")
-            else:
-                # Assume percentage
-                min_fraction = min_power / 100.0
-                max_fraction = max_power / 100.0
-                print(f"DEBUG: percent conversion - {min_power}/100={min_fraction}, {max_power}/100={max_fraction}")
-            
-            if min_power == max_power:
-                # Steady state
-                xml_element = f'<SteadyState Duration="{duration}" Power="{min_fraction}" pace="0"'
-            else:
-                # Ramp from min to max
-                xml_element = f'<Ramp Duration="{duration}" PowerLow="{min_fraction}" PowerHigh="{max_fraction}" pace="0"'
-        else:
-            # Steady state interval
-            power = calculate_power(power_target, ftp)  # Already a decimal
-            xml_element = f'<SteadyState Duration="{duration}" Power="{power}" pace="0"'
+    # Written to a buffer: repeated += on the element is quadratic for long text-event runs
+    buf = io.StringIO()
+    element, low, high = power or interval_power(interval.get('powerTarget', {}), ftp)
+    if element == 'Ramp':
+        buf.write(f'<Ramp Duration="{duration}" PowerLow="{low}" PowerHigh="{high}" pace="0"')
     else:
-        # Default to steady state if power format is unknown
-        power = calculate_power(power_target, ftp)  # Already a decimal
-        xml_element = f'<SteadyState Duration="{duration}" Power="{power}" pace="0"'
+        buf.write(f'<SteadyState Duration="{duration}" Power="{low}" pace="0"')
     
     # Add cadence target if specified
     if cadence_target:
         cadence_min = cadence_target.get('min')
         cadence_max = cadence_target.get('max')
         if cadence_min and cadence_max:
-            xml_element += f' Cadence="{cadence_min}-{cadence_max}"'
+            buf.write(f' Cadence="{cadence_min}-{cadence_max}"')
     
     # Add interval description and entertaining alerts as text events
     if interval_type or duration > 120:  # Add text events for intervals longer than 2 minutes
-        xml_element += '>'
+        buf.write('>')
         
         # Get contextual message sequence for this interval
         messages = dynamic_content.get_contextual_message_sequence(interval_type, duration)
         
         # Add all messages to the XML
         for msg in messages:
-            xml_element += f'\n      <textevent timeoffset="{msg["timeoffset"]}" message="{msg["message"]}"/>'
+            buf.write(f'\n      <textevent timeoffset="{msg["timeoffset"]}" '
+                      f'message="{xml_attr(msg["message"])}"/>')
         
-        xml_element += '\n    </SteadyState>' if 'SteadyState' in xml_element else '\n    </Ramp>'
+        buf.write(f'\n    </{element}>')
     else:
-        xml_element += '/>'
+        buf.write('/>')
     
-    return interval_type, xml_element
+    return interval_type, buf.getvalue()
 
 def generate_zwift_workouts_from_db(db_connection, start_date: str, end_date: str, 
                                    ftp: int = DEFAULT_FTP, output_dir: Optional[str] = None,
@@ -319,14 +355,16 @@ def generate_zwift_workouts_from_db(db_connection, start_date: str, end_date: st
         List of paths to generated .zwo files
     """
     generated_files = []
+    # Weekly folders already created in this batch, so makedirs runs once per folder
+    created_dirs: Set[str] = set()
     
     try:
-        print(f"DEBUG: Getting proposed workouts for date range {start_date} to {end_date}")
+        logger.debug("Getting proposed workouts for date range %s to %s", start_date, end_date)
         # Get all proposed workouts for the date range
         proposed_workouts_data = db_connection.get_proposed_workouts_for_week(start_date, end_date)
         daily_workouts = proposed_workouts_data.get('daily_workouts', [])
         
-        print(f"DEBUG: Found {len(daily_workouts)} daily workouts")
+        logger.debug("Found %d daily workouts", len(daily_workouts))
         
         # If week_number wasn't provided as an argument, try to get it from the data
         if week_number is None:
@@ -334,8 +372,7 @@ def generate_zwift_workouts_from_db(db_connection, start_date: str, end_date: st
             if weekly_plan and 'weekNumber' in weekly_plan:
                 week_number = weekly_plan.get('weekNumber')
                 
-        # Print debug info
-        print(f"Processing workouts for Week {week_number}")
+        logger.info("Processing workouts for Week %s", week_number)
         
         for workout in daily_workouts:
             # Only process cycling workouts
@@ -344,17 +381,17 @@ def generate_zwift_workouts_from_db(db_connection, start_date: str, end_date: st
                 workout_name = workout.get('name')
                 intervals_str = workout.get('intervals')
                 
-                print(f"\nDEBUG: Processing workout: {workout_name} on {workout_date}")
-                print(f"DEBUG: Raw intervals string: {intervals_str}")
+                logger.debug("Processing workout: %s on %s", workout_name, workout_date)
+                logger.debug("Raw intervals string: %s", intervals_str)
                 
                 # Parse intervals from JSON string
                 intervals = []
                 if intervals_str:
                     try:
                         intervals = json.loads(intervals_str)
-                        print(f"DEBUG: Successfully parsed {len(intervals)} intervals")
+                        logger.debug("Successfully parsed %d intervals", len(intervals))
                     except json.JSONDecodeError as e:
-                        print(f"ERROR: Failed to parse intervals JSON: {str(e)}")
+                        logger.error("Failed to parse intervals JSON: %s", e)
                         continue
                 
                 if intervals:
@@ -366,30 +403,30 @@ def generate_zwift_workouts_from_db(db_connection, start_date: str, end_date: st
                             intervals=intervals,
                             ftp=ftp,
                             output_dir=output_dir,
-                            week_number=week_number
+                            week_number=week_number,
+                            created_dirs=created_dirs
                         )
                         generated_files.append(output_file)
-                        print(f"Generated Zwift workout for '{workout_name}' on {workout_date}")
+                        logger.info("Generated Zwift workout for '%s' on %s",
+                                    workout_name, workout_date)
                     except Exception as e:
-                        print(f"Error generating Zwift workout for '{workout_name}': {str(e)}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.exception("Error generating Zwift workout for '%s': %s",
+                                         workout_name, e)
                 else:
-                    print(f"WARNING: No intervals found for workout '{workout_name}' on {workout_date}")
+                    logger.warning("No intervals found for workout '%s' on %s",
+                                   workout_name, workout_date)
     
     except Exception as e:
-        print(f"Error processing workouts from database: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing workouts from database: %s", e)
     
     return generated_files
 
-def format_power_target(power_target: Dict[str, Any], ftp: int) -> str:
-    """Format power target for description"""
+def format_power_target(power_target: Dict[str, Any], ftp: int,
+                        power: Optional[Tuple[str, float, float]] = None) -> str:
+    """Format power target for description, reusing a precomputed interval_power() result if given"""
     if isinstance(power_target, dict):
         if 'start' in power_target and 'end' in power_target:
-            start_power = calculate_power(power_target['start'], ftp)
-            end_power = calculate_power(power_target['end'], ftp)
+            _, start_power, end_power = power or interval_power(power_target, ftp)
             return f"{start_power*100:.0f}-{end_power*100:.0f}% FTP"
         elif 'min' in power_target and 'max' in power_target:
             # Handle direct min/max format with unit specification
@@ -405,8 +442,8 @@ def format_power_target(power_target: Dict[str, Any], ftp: int) -> str:
             else:
                 return f"{min_power}-{max_power}% FTP"
         elif 'type' in power_target:
-            power = calculate_power(power_target, ftp)
-            return f"{power*100:.0f}% FTP"
+            fraction = power[1] if power else calculate_power(power_target, ftp)
+            return f"{fraction*100:.0f}% FTP"
         elif 'value' in power_target:
             return f"{power_target['value']} watts"
     return "Unknown power target"